@@ -20,8 +20,18 @@ __version__ = "1.0.0"
 __author__ = "Your Name"
 __description__ = "MCP server with AI-powered development tools"
 
-# Make key classes available at package level
-from .ai_tools import OpenAIClient
-from .standalone_server import JSONRPCServer
-
 __all__ = ["OpenAIClient", "JSONRPCServer"]
+
+
+# Keep key classes available at package level, but resolve them lazily
+# (PEP 562) so importing mcp_poc doesn't pull in submodules until used.
+def __getattr__(name):
+    if name == "OpenAIClient":
+        from .ai_tools import OpenAIClient
+
+        return OpenAIClient
+    if name == "JSONRPCServer":
+        from .standalone_server import JSONRPCServer
+
+        return JSONRPCServer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
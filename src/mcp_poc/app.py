@@ -3,8 +3,495 @@ MCP AI POC Application - MCP Server Mode Only
 """
 
 import asyncio
+import atexit
+import functools
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+
+try:
+    import tiktoken
+except ImportError:  # token counts fall back to a size heuristic
+    tiktoken = None
+
+try:
+    import orjson
+except ImportError:  # stdlib json remains the fallback serializer
+    orjson = None
+
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:  # input() in a worker thread keeps the loop free
+    PromptSession = None
+
+from .ai_tools import OpenAIClient
+from .cache import DEFAULT_CACHE_DIR, CompletionCache
+from .rate_limit import RateLimiter, retry_after_seconds
+from .semantic_cache import SemanticCache
 from .standalone_server import main as server_main
 
+DEFAULT_MODEL = "gpt-4o"
+
+# Fixed system prompt loaded once at import. The exact same bytes are sent
+# on every request — no timestamps or per-turn substitutions — so OpenAI's
+# server-side prefix KV cache hits on every turn after the first.
+_SYSTEM_PROMPT_PATH = os.path.join(os.path.dirname(__file__), "prompts", "system.txt")
+try:
+    with open(_SYSTEM_PROMPT_PATH) as _f:
+        SYSTEM_PROMPT = _f.read()
+except OSError:
+    SYSTEM_PROMPT = "You are a helpful AI software development assistant."
+
+# Shared lazy OpenAI client for completion helpers; its httpx pool is
+# drained at interpreter exit rather than leaked.
+_openai_client = OpenAIClient()
+atexit.register(_openai_client.close)
+
+# Two-tier completion cache: repeated deterministic prompts skip the network
+# entirely, which dominates end-to-end latency for this workload.
+_completion_cache = CompletionCache(os.path.join(DEFAULT_CACHE_DIR, "completions.db"))
+
+# Optional semantic cache catching paraphrased repeats; enabled on demand.
+_semantic_cache = None
+
+# Optional request/token pacers, configured via set_rate_limit.
+_request_limiter = None
+_token_limiter = None
+
+
+def set_rate_limit(rpm: float = None, tpm: float = None):
+    """Configure proactive client-side pacing for all completion helpers.
+
+    rpm caps requests per minute, tpm caps prompt tokens per minute; pass
+    None to disable a bucket.
+    """
+    global _request_limiter, _token_limiter
+    _request_limiter = RateLimiter(rpm / 60.0, burst=rpm / 60.0 * 2) if rpm else None
+    _token_limiter = RateLimiter(tpm / 60.0, burst=tpm) if tpm else None
+
+
+def _pace_request(messages: list, model: str):
+    """Block until the configured buckets can afford this request."""
+    if _request_limiter is not None:
+        _request_limiter.wait_for_token()
+    if _token_limiter is not None:
+        cost = sum(_count_tokens(m.get("content", ""), model) for m in messages)
+        _token_limiter.wait_for_token(cost)
+
+
+def enable_semantic_cache(threshold: float = 0.95) -> SemanticCache:
+    """Turn on embedding-similarity caching for generate_completion."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        _semantic_cache = SemanticCache(
+            _openai_client.get_client, threshold=threshold
+        )
+    return _semantic_cache
+
+
+def _last_user_content(messages: list):
+    """Return the content of the most recent user message, if any."""
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content")
+    return None
+
+
+def _extract_content(response) -> str:
+    """Pull the first choice's content, copying only when stripping is needed."""
+    content = response.choices[0].message.content or ""
+    if content and (content[0].isspace() or content[-1].isspace()):
+        return content.strip()
+    return content
+
+
+def _canonical_json(value) -> bytes:
+    """Serialize value to compact, key-sorted JSON bytes.
+
+    Uses orjson when installed — 3-5x faster than stdlib json on the long
+    message histories that hit this path per call — with stdlib fallback.
+    """
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+
+def _cache_key(model: str, messages: list) -> str:
+    """Stable cache key for a (model, messages) pair."""
+    return hashlib.sha256(
+        model.encode() + b"\x00" + _canonical_json(messages)
+    ).hexdigest()
+
+
+@functools.lru_cache(maxsize=1)
+def _default_chat_create():
+    """chat.completions.create pre-bound to the default model.
+
+    Specializing the call once saves per-call kwarg resolution in tight
+    batch loops that stick to DEFAULT_MODEL.
+    """
+    client = _openai_client.get_client()
+    return functools.partial(client.chat.completions.create, model=DEFAULT_MODEL)
+
+
+def generate_completion(
+    messages, model: str = DEFAULT_MODEL, temperature: float = 0.0
+) -> str:
+    """Generate a chat completion, caching deterministic (temperature=0) calls.
+
+    Accepts either a full messages list or a bare prompt string, which is
+    wrapped as a single user message. Cache hits collapse a remote LLM
+    round-trip into a local lookup; stochastic calls (temperature > 0)
+    bypass the cache so sampled outputs stay fresh.
+    """
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    cacheable = temperature == 0
+    user_content = _last_user_content(messages)
+    if cacheable:
+        key = _cache_key(model, messages)
+        cached = _completion_cache.get(key)
+        if cached is not None:
+            return cached
+        if _semantic_cache is not None and user_content:
+            similar = _semantic_cache.lookup(user_content)
+            if similar is not None:
+                return similar
+
+    if model == DEFAULT_MODEL:
+        create = _default_chat_create()
+    else:
+        client = _openai_client.get_client()
+        create = functools.partial(client.chat.completions.create, model=model)
+
+    _pace_request(messages, model)
+    try:
+        response = create(messages=messages, temperature=temperature)
+    except Exception as exc:
+        # Honor a server-provided Retry-After exactly once, draining the
+        # request bucket so concurrent callers back off too.
+        delay = retry_after_seconds(exc)
+        if delay is None:
+            raise
+        if _request_limiter is not None:
+            _request_limiter.penalize(delay)
+        time.sleep(delay)
+        response = create(messages=messages, temperature=temperature)
+    content = _extract_content(response)
+
+    if cacheable:
+        _completion_cache.set(key, content)
+        if _semantic_cache is not None and user_content:
+            _semantic_cache.store(user_content, content)
+    return content
+
+
+def generate_completion_stream(
+    messages: list, model: str = DEFAULT_MODEL, temperature: float = 0.0
+):
+    """Yield completion tokens as they arrive from the streaming API.
+
+    Streaming moves user-visible latency from end-of-generation to
+    time-to-first-token; total tokens consumed are unchanged.
+    """
+    client = _openai_client.get_client()
+    stream = client.chat.completions.create(
+        model=model, messages=messages, temperature=temperature, stream=True
+    )
+    for chunk in stream:
+        yield chunk.choices[0].delta.content or ""
+
+
+_PACKED_ANSWER_RE = re.compile(r"^###(\d+)\s*", re.MULTILINE)
+
+
+def _split_packed_response(text: str, count: int):
+    """Split a packed multi-answer reply on its ###i markers.
+
+    Returns a list of `count` answers, or None when the reply doesn't carry
+    exactly the expected markers.
+    """
+    matches = list(_PACKED_ANSWER_RE.finditer(text))
+    if [int(m.group(1)) for m in matches] != list(range(1, count + 1)):
+        return None
+    answers = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        answers.append(text[match.end():end].strip())
+    return answers
+
+
+def generate_many(
+    system: str, user_prompts: list, model: str = DEFAULT_MODEL
+) -> list:
+    """Answer several independent prompts with a single chat request.
+
+    Packs the prompts into one numbered user message sharing the system
+    prefix, so K requests collapse into one against the RPM budget. Falls
+    back to per-prompt calls when the packed reply can't be parsed.
+    """
+    numbered = "\n".join(f"{i}) {p}" for i, p in enumerate(user_prompts, start=1))
+    packed = (
+        "Answer each of the following independently. "
+        "Prefix each answer with ###i where i is the question number.\n"
+        f"{numbered}"
+    )
+    messages = [
+        {"role": "system", "content": system},
+        {"role": "user", "content": packed},
+    ]
+    response = generate_completion(messages, model=model)
+    answers = _split_packed_response(response, len(user_prompts))
+    if answers is not None:
+        return answers
+
+    # Parse failure: fall back to one request per prompt.
+    return [
+        generate_completion(
+            [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt},
+            ],
+            model=model,
+        )
+        for prompt in user_prompts
+    ]
+
+
+async def generate_completions_many(
+    prompts: list,
+    model: str = DEFAULT_MODEL,
+    concurrency: int = 16,
+    temperature: float = 0.0,
+) -> list:
+    """Run many independent chat completions concurrently.
+
+    Each entry in prompts is a messages list. A bounded semaphore keeps at
+    most `concurrency` requests in flight, collapsing N serial round-trips
+    into roughly one while staying under rate limits.
+    """
+    aclient = _openai_client.get_async_client()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def _one(messages: list) -> str:
+        async with sem:
+            if _request_limiter is not None:
+                await _request_limiter.await_token()
+            if _token_limiter is not None:
+                cost = sum(
+                    _count_tokens(m.get("content", ""), model) for m in messages
+                )
+                await _token_limiter.await_token(cost)
+            response = await aclient.chat.completions.create(
+                model=model, messages=messages, temperature=temperature
+            )
+            return _extract_content(response)
+
+    return list(await asyncio.gather(*(_one(p) for p in prompts)))
+
+
+# Keep conversation uploads bounded: trim history once it would exceed the
+# context budget, reserving room for the model's response.
+MAX_CTX_TOKENS = 8000
+RESPONSE_RESERVE = 2000
+
+
+@functools.lru_cache(maxsize=4)
+def _encoder_for(model: str):
+    if tiktoken is None:
+        return None
+    # tiktoken downloads encoding tables on first use; fall back to the
+    # heuristic rather than fail offline.
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        try:
+            return tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+
+def _count_tokens(text: str, model: str) -> int:
+    """Token count for text, approximated as len/4 without tiktoken."""
+    encoder = _encoder_for(model)
+    if encoder is None:
+        return max(1, len(text) // 4)
+    return len(encoder.encode(text))
+
+
+def _trim_messages(
+    messages: deque,
+    model: str,
+    budget: int = MAX_CTX_TOKENS - RESPONSE_RESERVE,
+):
+    """Drop oldest turns until the history fits the token budget.
+
+    A system message pinned at index 0 is never dropped, so per-turn upload
+    size and TPM cost stop growing with conversation length.
+    """
+
+    def _total() -> int:
+        return sum(_count_tokens(m["content"], model) for m in messages)
+
+    while len(messages) > 1 and _total() > budget:
+        if messages[0].get("role") == "system":
+            if len(messages) <= 2:
+                break
+            del messages[1]
+        else:
+            messages.popleft()
+
+
+async def _read_user_input(session) -> str:
+    """Read a prompt without blocking the event loop."""
+    if session is not None:
+        return await session.prompt_async("You: ")
+    return await asyncio.to_thread(input, "You: ")
+
+
+async def chat_loop():
+    """Interactive async chat REPL that streams responses token by token.
+
+    Reading input off the event loop lets background work — like indexing
+    the previous turn into the semantic cache — overlap with user typing
+    instead of delaying the next request.
+    """
+    selected_model = select_model()
+    # The system message stays pinned at index 0; the trimmer never drops it.
+    messages: deque = deque([{"role": "system", "content": SYSTEM_PROMPT}])
+    session = PromptSession() if PromptSession is not None else None
+    pending: set = set()
+    print("Type 'exit' or 'quit' to leave the chat.")
+
+    while True:
+        try:
+            user_input = (await _read_user_input(session)).strip()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if user_input.lower() in ("exit", "quit"):
+            break
+        if not user_input:
+            continue
+
+        messages.append({"role": "user", "content": user_input})
+        _trim_messages(messages, selected_model)
+        sys.stdout.write("AI: ")
+        parts = []
+
+        def _stream(history: list):
+            for token in generate_completion_stream(history, model=selected_model):
+                sys.stdout.write(token)
+                sys.stdout.flush()
+                parts.append(token)
+
+        await asyncio.to_thread(_stream, list(messages))
+        sys.stdout.write("\n")
+        reply = "".join(parts)
+        messages.append({"role": "assistant", "content": reply})
+        _trim_messages(messages, selected_model)
+
+        # Index the finished turn during the user's think-time.
+        if _semantic_cache is not None:
+            task = asyncio.create_task(
+                asyncio.to_thread(_semantic_cache.store, user_input, reply)
+            )
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+MODELS_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "models.json")
+MODELS_CACHE_TTL = 24 * 3600
+
+
+@functools.lru_cache(maxsize=1)
+def _list_chat_models() -> tuple:
+    """Sorted chat-capable model ids, fetched at most once per process.
+
+    The result is also persisted to disk with a 24h TTL so cold starts skip
+    the models.list() round-trip entirely.
+    """
+    try:
+        with open(MODELS_CACHE_PATH) as f:
+            data = json.load(f)
+        if time.time() - data["fetched"] < MODELS_CACHE_TTL:
+            return tuple(data["models"])
+    except (OSError, ValueError, KeyError):
+        pass
+
+    client = _openai_client.get_client()
+    models = tuple(
+        sorted(m.id for m in client.models.list().data if "gpt" in m.id.casefold())
+    )
+    try:
+        os.makedirs(os.path.dirname(MODELS_CACHE_PATH) or ".", exist_ok=True)
+        with open(MODELS_CACHE_PATH, "w") as f:
+            json.dump({"fetched": time.time(), "models": list(models)}, f)
+    except OSError:
+        pass
+    return models
+
+
+LAST_MODEL_PATH = os.path.expanduser("~/.config/mcp_poc/last_model")
+
+
+def _read_last_model():
+    """Return the model persisted by a previous session, if any."""
+    try:
+        with open(LAST_MODEL_PATH) as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _write_last_model(model: str):
+    try:
+        os.makedirs(os.path.dirname(LAST_MODEL_PATH) or ".", exist_ok=True)
+        with open(LAST_MODEL_PATH, "w") as f:
+            f.write(model)
+    except OSError:
+        pass
+
+
+def select_model(default: str = DEFAULT_MODEL) -> str:
+    """Interactively pick a chat model, falling back to the default.
+
+    With MCP_POC_SKIP_MODEL_SELECT=1 the previously chosen model is reused
+    without any models.list() round-trip at all.
+    """
+    last_model = _read_last_model()
+    if last_model and os.getenv("MCP_POC_SKIP_MODEL_SELECT") == "1":
+        return last_model
+
+    chat_models = _list_chat_models()
+    if not chat_models:
+        return default
+
+    print("Available chat models:")
+    for i, model_id in enumerate(chat_models, start=1):
+        print(f"  {i}. {model_id}")
+
+    choice = input(f"Select a model (1-{len(chat_models)}) [default: {default}]: ")
+    choice = choice.strip()
+    selected = default
+    if choice:
+        try:
+            model_index = int(choice) - 1
+        except ValueError:
+            model_index = -1
+        if 0 <= model_index < len(chat_models):
+            selected = chat_models[model_index]
+    _write_last_model(selected)
+    return selected
+
 
 def main():
     """Main entry point - runs MCP server only."""
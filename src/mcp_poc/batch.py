@@ -0,0 +1,71 @@
+"""
+OpenAI Batch API helpers for large offline prompt jobs.
+
+The Batch API bills at half price and draws on a separate, much higher rate
+limit pool, at the cost of a completion window measured in hours. Use it for
+offline jobs of roughly a thousand requests or more — not for the interactive
+chat loop, where per-request latency matters.
+"""
+
+import io
+import json
+import time
+
+from .ai_tools import OpenAIClient
+
+_openai_client = OpenAIClient()
+
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+def submit_batch(requests: list, endpoint: str = "/v1/chat/completions") -> str:
+    """Submit a list of chat-completion request bodies as one batch job.
+
+    Each entry in requests is a chat.completions payload (model, messages,
+    etc.). Returns the batch id to poll with wait_for_batch.
+    """
+    lines = []
+    for i, body in enumerate(requests):
+        lines.append(
+            json.dumps(
+                {
+                    "custom_id": f"request-{i}",
+                    "method": "POST",
+                    "url": endpoint,
+                    "body": body,
+                }
+            )
+        )
+    payload = io.BytesIO("\n".join(lines).encode())
+
+    client = _openai_client.get_client()
+    batch_file = client.files.create(file=payload, purpose="batch")
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=endpoint,
+        completion_window="24h",
+    )
+    return batch.id
+
+
+def wait_for_batch(batch_id: str, poll: float = 30.0):
+    """Poll a batch until it reaches a terminal state, then yield results.
+
+    Yields one parsed dict per output line once the batch completes. Raises
+    RuntimeError if the batch finishes without producing output (failed or
+    expired).
+    """
+    client = _openai_client.get_client()
+    while True:
+        batch = client.batches.retrieve(batch_id)
+        if batch.status in TERMINAL_STATUSES:
+            break
+        time.sleep(poll)
+
+    if batch.status != "completed" or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch_id} ended with status: {batch.status}")
+
+    content = client.files.content(batch.output_file_id).read()
+    for line in content.splitlines():
+        if line.strip():
+            yield json.loads(line)
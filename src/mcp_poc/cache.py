@@ -0,0 +1,127 @@
+"""
+Caching utilities for avoiding redundant OpenAI calls.
+
+Provides a two-tier cache: a small in-memory LRU for the hot path plus an
+SQLite-backed disk cache so completions survive process restarts. SQLite is
+used instead of a third-party cache package to keep the POC dependency-free.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_CACHE_DIR = os.path.expanduser("~/.cache/mcp_poc")
+
+# Disk cache defaults: entries expire after a week, cap the DB at 1 GB.
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_BYTES = 1024**3
+
+
+class DiskCache:
+    """SQLite-backed key/value cache with TTL expiry and a size cap."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT, created REAL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str):
+        """Return the cached value for key, or None if missing/expired."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if time.time() - created > self.ttl:
+            with self._lock:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                conn.commit()
+            return None
+        return value
+
+    def set(self, key: str, value: str):
+        """Store a value, evicting oldest entries if over the size cap."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+            conn.commit()
+            self._evict_if_needed(conn)
+
+    def _evict_if_needed(self, conn: sqlite3.Connection):
+        (total,) = conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM cache"
+        ).fetchone()
+        while total > self.max_bytes:
+            row = conn.execute(
+                "SELECT key, LENGTH(value) FROM cache ORDER BY created LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            conn.execute("DELETE FROM cache WHERE key = ?", (row[0],))
+            total -= row[1]
+        conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class CompletionCache:
+    """Two-tier cache: in-memory LRU backed by a DiskCache."""
+
+    def __init__(self, path: str, memory_size: int = 1024, **disk_kwargs):
+        self.memory_size = memory_size
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._disk = DiskCache(path, **disk_kwargs)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        """Look up key in memory first, falling back to disk."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+        value = self._disk.get(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def set(self, key: str, value: str):
+        """Store a value in both tiers."""
+        self._remember(key, value)
+        self._disk.set(key, value)
+
+    def _remember(self, key: str, value: str):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
@@ -3,8 +3,14 @@ MCP Server implementation for AI-powered tools and resources.
 """
 
 import asyncio
+import functools
 import logging
+import os
+import random
 import sys
+import threading
+import time
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 
 from mcp.server import Server
@@ -23,107 +29,100 @@ from mcp.types import (
 )
 
 from .ai_tools import OpenAIClient
+from .rate_limit import CircuitBreaker, CircuitBreakerOpen, retry_after_seconds
 
+# Use uvloop's libuv-backed event loop when available: stdio-heavy MCP
+# traffic benefits from its cheaper per-I/O and per-callback scheduling.
+# On platforms without uvloop (e.g. Windows) the default loop is used.
+try:
+    import uvloop
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+    uvloop.install()
+except ImportError:
+    pass
+
+
+# Logging is configured by the entry point (see __main__ below); importing
+# this module must not install a root handler.
 logger = logging.getLogger(__name__)
 
 # Global OpenAI client
 openai_client = OpenAIClient()
 
+# Static protocol metadata, built once at import time. The list-* handlers
+# return copies of these frozen tuples instead of reconstructing the model
+# trees (and re-running pydantic validation) on every request.
+_PROMPTS: tuple = (
+    Prompt(
+        name="analyze_code",
+        description="Analyze code for quality, security, and best practices",
+        arguments=[
+            PromptArgument(
+                name="code",
+                description="The code to analyze",
+                required=True,
+            ),
+            PromptArgument(
+                name="language",
+                description="Programming language of the code",
+                required=False,
+            ),
+        ],
+    ),
+    Prompt(
+        name="generate_documentation",
+        description="Generate comprehensive documentation for code",
+        arguments=[
+            PromptArgument(
+                name="code",
+                description="The code to document",
+                required=True,
+            ),
+            PromptArgument(
+                name="style",
+                description="Documentation style (e.g., 'sphinx', 'google', 'numpy')",
+                required=False,
+            ),
+        ],
+    ),
+    Prompt(
+        name="code_review",
+        description="Perform a comprehensive code review",
+        arguments=[
+            PromptArgument(
+                name="code", description="The code to review", required=True
+            ),
+            PromptArgument(
+                name="focus",
+                description="Review focus (e.g., 'security', 'performance', 'maintainability')",
+                required=False,
+            ),
+        ],
+    ),
+    Prompt(
+        name="explain_concept",
+        description="Explain programming concepts or technologies",
+        arguments=[
+            PromptArgument(
+                name="concept",
+                description="The concept to explain",
+                required=True,
+            ),
+            PromptArgument(
+                name="level",
+                description="Explanation level (e.g., 'beginner', 'intermediate', 'advanced')",
+                required=False,
+            ),
+        ],
+    ),
+)
 
-class MCPAIServer:
-    """MCP Server that provides AI-powered tools and resources."""
-
-    def __init__(self):
-        self.server = Server("mcp-ai-poc")
-        self.setup_handlers()
-
-    def setup_handlers(self):
-        """Set up all MCP protocol handlers."""
-
-        @self.server.list_prompts()
-        async def handle_list_prompts() -> List[Prompt]:
-            """List available prompts."""
-            return [
-                Prompt(
-                    name="analyze_code",
-                    description="Analyze code for quality, security, and best practices",
-                    arguments=[
-                        PromptArgument(
-                            name="code",
-                            description="The code to analyze",
-                            required=True,
-                        ),
-                        PromptArgument(
-                            name="language",
-                            description="Programming language of the code",
-                            required=False,
-                        ),
-                    ],
-                ),
-                Prompt(
-                    name="generate_documentation",
-                    description="Generate comprehensive documentation for code",
-                    arguments=[
-                        PromptArgument(
-                            name="code",
-                            description="The code to document",
-                            required=True,
-                        ),
-                        PromptArgument(
-                            name="style",
-                            description="Documentation style (e.g., 'sphinx', 'google', 'numpy')",
-                            required=False,
-                        ),
-                    ],
-                ),
-                Prompt(
-                    name="code_review",
-                    description="Perform a comprehensive code review",
-                    arguments=[
-                        PromptArgument(
-                            name="code", description="The code to review", required=True
-                        ),
-                        PromptArgument(
-                            name="focus",
-                            description="Review focus (e.g., 'security', 'performance', 'maintainability')",
-                            required=False,
-                        ),
-                    ],
-                ),
-                Prompt(
-                    name="explain_concept",
-                    description="Explain programming concepts or technologies",
-                    arguments=[
-                        PromptArgument(
-                            name="concept",
-                            description="The concept to explain",
-                            required=True,
-                        ),
-                        PromptArgument(
-                            name="level",
-                            description="Explanation level (e.g., 'beginner', 'intermediate', 'advanced')",
-                            required=False,
-                        ),
-                    ],
-                ),
-            ]
-
-        @self.server.get_prompt()
-        async def handle_get_prompt(
-            name: str, arguments: Optional[Dict[str, str]] = None
-        ) -> GetPromptResult:
-            """Get a specific prompt."""
-            if arguments is None:
-                arguments = {}
-
-            if name == "analyze_code":
-                code = arguments.get("code", "")
-                language = arguments.get("language", "unknown")
-
-                prompt = f"""Analyze the following {language} code for:
+# Prompt templates rendered per request: name -> (template, description
+# template, defaults). One dict lookup plus a C-level format_map replaces the
+# old if/elif chain of re-built f-strings.
+_PROMPT_TEMPLATES = {
+    sys.intern("analyze_code"): (
+        """Analyze the following {language} code for:
 1. Code quality and best practices
 2. Potential bugs or issues
 3. Security vulnerabilities
@@ -135,22 +134,12 @@ Code to analyze:
 {code}
 ```
 
-Provide a detailed analysis with specific recommendations for improvement."""
-
-                return GetPromptResult(
-                    description=f"Code analysis for {language} code",
-                    messages=[
-                        PromptMessage(
-                            role="user", content=TextContent(type="text", text=prompt)
-                        )
-                    ],
-                )
-
-            elif name == "generate_documentation":
-                code = arguments.get("code", "")
-                style = arguments.get("style", "google")
-
-                prompt = f"""Generate comprehensive documentation for the following code using {style} style:
+Provide a detailed analysis with specific recommendations for improvement.""",
+        "Code analysis for {language} code",
+        {"code": "", "language": "unknown"},
+    ),
+    sys.intern("generate_documentation"): (
+        """Generate comprehensive documentation for the following code using {style} style:
 
 Code:
 ```
@@ -164,22 +153,12 @@ Include:
 4. Usage examples
 5. Exception handling information
 
-Use {style} documentation format."""
-
-                return GetPromptResult(
-                    description=f"Documentation generation using {style} style",
-                    messages=[
-                        PromptMessage(
-                            role="user", content=TextContent(type="text", text=prompt)
-                        )
-                    ],
-                )
-
-            elif name == "code_review":
-                code = arguments.get("code", "")
-                focus = arguments.get("focus", "general")
-
-                prompt = f"""Perform a comprehensive code review with focus on {focus}:
+Use {style} documentation format.""",
+        "Documentation generation using {style} style",
+        {"code": "", "style": "google"},
+    ),
+    sys.intern("code_review"): (
+        """Perform a comprehensive code review with focus on {focus}:
 
 Code to review:
 ```
@@ -196,22 +175,12 @@ Review criteria:
 
 Focus area: {focus}
 
-Provide constructive feedback with specific suggestions for improvement."""
-
-                return GetPromptResult(
-                    description=f"Code review with {focus} focus",
-                    messages=[
-                        PromptMessage(
-                            role="user", content=TextContent(type="text", text=prompt)
-                        )
-                    ],
-                )
-
-            elif name == "explain_concept":
-                concept = arguments.get("concept", "")
-                level = arguments.get("level", "intermediate")
-
-                prompt = f"""Explain the programming concept "{concept}" at a {level} level.
+Provide constructive feedback with specific suggestions for improvement.""",
+        "Code review with {focus} focus",
+        {"code": "", "focus": "general"},
+    ),
+    sys.intern("explain_concept"): (
+        """Explain the programming concept "{concept}" at a {level} level.
 
 Include:
 1. Clear definition and explanation
@@ -221,382 +190,193 @@ Include:
 5. Common pitfalls to avoid
 6. Related concepts
 
-Tailor the explanation to a {level} audience."""
-
-                return GetPromptResult(
-                    description=f"Explanation of {concept} at {level} level",
-                    messages=[
-                        PromptMessage(
-                            role="user", content=TextContent(type="text", text=prompt)
-                        )
-                    ],
-                )
-
-            else:
-                raise ValueError(f"Unknown prompt: {name}")
-
-        @self.server.list_tools()
-        async def handle_list_tools() -> List[Tool]:
-            """List available tools."""
-            return [
-                Tool(
-                    name="generate_code",
-                    description="Generate code based on specifications",
-                    inputSchema={
+Tailor the explanation to a {level} audience.""",
+        "Explanation of {concept} at {level} level",
+        {"concept": "", "level": "intermediate"},
+    ),
+}
+
+
+_TOOLS: tuple = (
+    Tool(
+        name="generate_code",
+        description="Generate code based on specifications",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "specification": {
+                    "type": "string",
+                    "description": "Description of what code to generate",
+                },
+                "language": {
+                    "type": "string",
+                    "description": "Programming language for the code",
+                    "default": "python",
+                },
+                "style": {
+                    "type": "string",
+                    "description": "Coding style or framework to use",
+                    "default": "clean",
+                },
+            },
+            "required": ["specification"],
+        },
+    ),
+    Tool(
+        name="refactor_code",
+        description="Refactor existing code for better quality",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "The code to refactor",
+                },
+                "goal": {
+                    "type": "string",
+                    "description": "Refactoring goal (e.g., 'performance', 'readability', 'maintainability')",
+                    "default": "maintainability",
+                },
+                "language": {
+                    "type": "string",
+                    "description": "Programming language of the code",
+                    "default": "python",
+                },
+            },
+            "required": ["code"],
+        },
+    ),
+    Tool(
+        name="debug_code",
+        description="Help debug code issues and find solutions",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "The code with issues",
+                },
+                "error": {
+                    "type": "string",
+                    "description": "Error message or description of the problem",
+                },
+                "context": {
+                    "type": "string",
+                    "description": "Additional context about when the error occurs",
+                },
+            },
+            "required": ["code", "error"],
+        },
+    ),
+    Tool(
+        name="optimize_performance",
+        description="Analyze and optimize code performance",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "The code to optimize",
+                },
+                "bottleneck": {
+                    "type": "string",
+                    "description": "Known performance bottleneck or area of concern",
+                },
+                "constraints": {
+                    "type": "string",
+                    "description": "Performance constraints or requirements",
+                },
+            },
+            "required": ["code"],
+        },
+    ),
+    Tool(
+        name="generate_tests",
+        description="Generate unit tests for given code",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "The code to generate tests for",
+                },
+                "framework": {
+                    "type": "string",
+                    "description": "Testing framework to use (e.g., 'pytest', 'unittest', 'jest')",
+                    "default": "pytest",
+                },
+                "coverage": {
+                    "type": "string",
+                    "description": "Desired test coverage level",
+                    "default": "comprehensive",
+                },
+            },
+            "required": ["code"],
+        },
+    ),
+    Tool(
+        name="batch_tools",
+        description="Run several independent tool calls concurrently",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "calls": {
+                    "type": "array",
+                    "description": "Tool invocations to run in parallel",
+                    "items": {
                         "type": "object",
                         "properties": {
-                            "specification": {
+                            "name": {
                                 "type": "string",
-                                "description": "Description of what code to generate",
+                                "description": "Name of the tool to invoke",
                             },
-                            "language": {
-                                "type": "string",
-                                "description": "Programming language for the code",
-                                "default": "python",
-                            },
-                            "style": {
-                                "type": "string",
-                                "description": "Coding style or framework to use",
-                                "default": "clean",
+                            "arguments": {
+                                "type": "object",
+                                "description": "Arguments for that tool",
                             },
                         },
-                        "required": ["specification"],
+                        "required": ["name"],
                     },
-                ),
-                Tool(
-                    name="refactor_code",
-                    description="Refactor existing code for better quality",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code to refactor",
-                            },
-                            "goal": {
-                                "type": "string",
-                                "description": "Refactoring goal (e.g., 'performance', 'readability', 'maintainability')",
-                                "default": "maintainability",
-                            },
-                            "language": {
-                                "type": "string",
-                                "description": "Programming language of the code",
-                                "default": "python",
-                            },
-                        },
-                        "required": ["code"],
-                    },
-                ),
-                Tool(
-                    name="debug_code",
-                    description="Help debug code issues and find solutions",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code with issues",
-                            },
-                            "error": {
-                                "type": "string",
-                                "description": "Error message or description of the problem",
-                            },
-                            "context": {
-                                "type": "string",
-                                "description": "Additional context about when the error occurs",
-                            },
-                        },
-                        "required": ["code", "error"],
-                    },
-                ),
-                Tool(
-                    name="optimize_performance",
-                    description="Analyze and optimize code performance",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code to optimize",
-                            },
-                            "bottleneck": {
-                                "type": "string",
-                                "description": "Known performance bottleneck or area of concern",
-                            },
-                            "constraints": {
-                                "type": "string",
-                                "description": "Performance constraints or requirements",
-                            },
-                        },
-                        "required": ["code"],
-                    },
-                ),
-                Tool(
-                    name="generate_tests",
-                    description="Generate unit tests for given code",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code to generate tests for",
-                            },
-                            "framework": {
-                                "type": "string",
-                                "description": "Testing framework to use (e.g., 'pytest', 'unittest', 'jest')",
-                                "default": "pytest",
-                            },
-                            "coverage": {
-                                "type": "string",
-                                "description": "Desired test coverage level",
-                                "default": "comprehensive",
-                            },
-                        },
-                        "required": ["code"],
-                    },
-                ),
-            ]
-
-        @self.server.call_tool()  # type: ignore
-        async def handle_call_tool(
-            name: str, arguments: Optional[Dict[str, Any]] = None
-        ) -> CallToolResult:
-            """Handle tool calls."""
-            if arguments is None:
-                arguments = {}
-
-            try:
-                client = openai_client.get_client()
-
-                if name == "generate_code":
-                    specification = arguments.get("specification", "")
-                    language = arguments.get("language", "python")
-                    style = arguments.get("style", "clean")
-
-                    prompt = f"""Generate {language} code based on this specification:
-
-{specification}
-
-Requirements:
-- Use {style} coding style
-- Include appropriate comments
-- Follow best practices for {language}
-- Make the code production-ready
-- Include error handling where appropriate
-
-Generate only the code, no explanations."""
-
-                    response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.3,
-                    )
-
-                    return CallToolResult(
-                        content=[
-                            TextContent(
-                                type="text",
-                                text=response.choices[0].message.content
-                                or "No response generated",
-                            )
-                        ]
-                    )
-
-                elif name == "refactor_code":
-                    code = arguments.get("code", "")
-                    goal = arguments.get("goal", "maintainability")
-                    language = arguments.get("language", "python")
-
-                    prompt = f"""Refactor this {language} code with focus on {goal}:
-
-Original code:
-```{language}
-{code}
-```
-
-Refactoring goals:
-- Improve {goal}
-- Maintain functionality
-- Follow {language} best practices
-- Add improvements where beneficial
-
-Provide the refactored code with comments explaining the changes."""
-
-                    response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.3,
-                    )
-
-                    return CallToolResult(
-                        content=[
-                            TextContent(
-                                type="text",
-                                text=response.choices[0].message.content
-                                or "No response generated",
-                            )
-                        ]
-                    )
-
-                elif name == "debug_code":
-                    code = arguments.get("code", "")
-                    error = arguments.get("error", "")
-                    context = arguments.get("context", "")
-
-                    prompt = f"""Help debug this code issue:
-
-Code:
-```
-{code}
-```
-
-Error: {error}
-
-Context: {context}
-
-Please:
-1. Identify the root cause of the issue
-2. Explain why the error is occurring
-3. Provide a fixed version of the code
-4. Suggest preventive measures for similar issues"""
-
-                    response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.3,
-                    )
-
-                    return CallToolResult(
-                        content=[
-                            TextContent(
-                                type="text",
-                                text=response.choices[0].message.content
-                                or "No response generated",
-                            )
-                        ]
-                    )
-
-                elif name == "optimize_performance":
-                    code = arguments.get("code", "")
-                    bottleneck = arguments.get("bottleneck", "")
-                    constraints = arguments.get("constraints", "")
-
-                    prompt = f"""Analyze and optimize this code for performance:
-
-Code:
-```
-{code}
-```
-
-Known bottleneck: {bottleneck}
-Constraints: {constraints}
-
-Please:
-1. Identify performance issues
-2. Suggest optimization strategies
-3. Provide optimized code
-4. Explain the performance improvements
-5. Mention any trade-offs"""
-
-                    response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.3,
-                    )
-
-                    return CallToolResult(
-                        content=[
-                            TextContent(
-                                type="text",
-                                text=response.choices[0].message.content
-                                or "No response generated",
-                            )
-                        ]
-                    )
-
-                elif name == "generate_tests":
-                    code = arguments.get("code", "")
-                    framework = arguments.get("framework", "pytest")
-                    coverage = arguments.get("coverage", "comprehensive")
-
-                    prompt = f"""Generate {coverage} unit tests for this code using {framework}:
-
-Code to test:
-```
-{code}
-```
-
-Test requirements:
-- Use {framework} framework
-- {coverage} test coverage
-- Test both positive and negative cases
-- Include edge cases
-- Add appropriate assertions
-- Follow testing best practices
-
-Generate complete test code that can be run immediately."""
-
-                    response = client.chat.completions.create(
-                        model="gpt-4o",
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=0.3,
-                    )
-
-                    return CallToolResult(
-                        content=[
-                            TextContent(
-                                type="text",
-                                text=response.choices[0].message.content
-                                or "No response generated",
-                            )
-                        ]
-                    )
-
-                else:
-                    raise ValueError(f"Unknown tool: {name}")
-
-            except Exception as e:
-                logger.error(f"Error in tool {name}: {e}")
-                return CallToolResult(
-                    content=[TextContent(type="text", text=f"Error: {str(e)}")],
-                    isError=True,
-                )
+                },
+            },
+            "required": ["calls"],
+        },
+    ),
+)
 
-        @self.server.list_resources()  # type: ignore
-        async def handle_list_resources() -> List[Resource]:
-            """List available resources."""
-            return [
-                Resource(
-                    uri="coding-guidelines://python",  # type: ignore
-                    name="Python Coding Guidelines",
-                    description="Comprehensive Python coding best practices and guidelines",
-                    mimeType="text/markdown",
-                ),
-                Resource(
-                    uri="patterns://design-patterns",  # type: ignore
-                    name="Design Patterns Reference",
-                    description="Common software design patterns with examples",
-                    mimeType="text/markdown",
-                ),
-                Resource(
-                    uri="security://best-practices",  # type: ignore                    name="Security Best Practices",
-                    description="Security guidelines for safe coding practices",
-                    mimeType="text/markdown",
-                ),
-                Resource(
-                    uri="performance://optimization-guide",  # type: ignore
-                    name="Performance Optimization Guide",
-                    description="Techniques and strategies for code optimization",
-                    mimeType="text/markdown",
-                ),
-            ]
+_RESOURCES: tuple = (
+    Resource(
+        uri="coding-guidelines://python",  # type: ignore
+        name="Python Coding Guidelines",
+        description="Comprehensive Python coding best practices and guidelines",
+        mimeType="text/markdown",
+    ),
+    Resource(
+        uri="patterns://design-patterns",  # type: ignore
+        name="Design Patterns Reference",
+        description="Common software design patterns with examples",
+        mimeType="text/markdown",
+    ),
+    Resource(
+        uri="security://best-practices",  # type: ignore
+        name="Security Best Practices",
+        description="Security guidelines for safe coding practices",
+        mimeType="text/markdown",
+    ),
+    Resource(
+        uri="performance://optimization-guide",  # type: ignore
+        name="Performance Optimization Guide",
+        description="Techniques and strategies for code optimization",
+        mimeType="text/markdown",
+    ),
+)
 
-        @self.server.read_resource()  # type: ignore
-        async def handle_read_resource(uri: str) -> ReadResourceResult:
-            """Read a specific resource."""
 
-            if uri == "coding-guidelines://python":
-                content = """# Python Coding Guidelines
+# Resource bodies and their fully-built results, computed once at import.
+# Reads become O(1) dict lookups returning a shared read-only model instead
+# of re-validating a fresh ReadResourceResult per request.
+_RESOURCE_TEXTS = {
+    "coding-guidelines://python": """# Python Coding Guidelines
 
 ## Code Style
 - Follow PEP 8 for style guidelines
@@ -622,10 +402,8 @@ Generate complete test code that can be run immediately."""
 - Use parameterized queries for database operations
 - Don't store secrets in code
 - Keep dependencies up to date
-"""
-
-            elif uri == "patterns://design-patterns":
-                content = """# Design Patterns Reference
+""",
+    "patterns://design-patterns": """# Design Patterns Reference
 
 ## Creational Patterns
 - **Singleton**: Ensure only one instance exists
@@ -644,10 +422,8 @@ Generate complete test code that can be run immediately."""
 
 ## When to Use
 Choose patterns based on the specific problem you're solving, not because they're popular.
-"""
-
-            elif uri == "security://best-practices":
-                content = """# Security Best Practices
+""",
+    "security://best-practices": """# Security Best Practices
 
 ## Input Validation
 - Validate all user inputs
@@ -674,10 +450,8 @@ Choose patterns based on the specific problem you're solving, not because they'r
 - Keep all dependencies updated
 - Use vulnerability scanners
 - Review third-party code
-"""
-
-            elif uri == "performance://optimization-guide":
-                content = """# Performance Optimization Guide
+""",
+    "performance://optimization-guide": """# Performance Optimization Guide
 
 ## Profiling
 - Measure before optimizing
@@ -703,23 +477,459 @@ Choose patterns based on the specific problem you're solving, not because they'r
 - Use async/await for I/O-bound operations
 - Consider multiprocessing for CPU-bound tasks
 - Be aware of GIL limitations in Python
-"""
-            else:
-                raise ValueError(f"Unknown resource: {uri}")
+""",
+}
+
+_RESOURCE_RESULTS = {
+    sys.intern(uri): ReadResourceResult(
+        contents=[
+            TextResourceContents(
+                uri=uri,  # type: ignore
+                mimeType="text/markdown",
+                text=text,
+            )
+        ]
+    )
+    for uri, text in _RESOURCE_TEXTS.items()
+}
+
+# Tool completions are memoized: identical prompts skip the network and model
+# entirely, and an optional semantic tier catches paraphrased repeats.
+_semantic_cache = None
+
+
+def enable_semantic_cache(threshold: float = 0.95):
+    """Turn on embedding-similarity caching for tool completions."""
+    global _semantic_cache
+    if _semantic_cache is None:
+        from .semantic_cache import SemanticCache
+
+        _semantic_cache = SemanticCache(
+            openai_client.get_client, threshold=threshold
+        )
+    return _semantic_cache
+
+
+# Per-tool prompt templates and argument defaults. Each handler is a tiny
+# closure doing one dict merge plus one C-level format_map, so dispatch
+# resolves with a single lookup and no per-tool glue code.
+_TOOL_DEFAULTS = {
+    "generate_code": {
+        "specification": "",
+        "language": "python",
+        "style": "clean",
+    },
+    "refactor_code": {
+        "code": "",
+        "goal": "maintainability",
+        "language": "python",
+    },
+    "debug_code": {"code": "", "error": "", "context": ""},
+    "optimize_performance": {"code": "", "bottleneck": "", "constraints": ""},
+    "generate_tests": {
+        "code": "",
+        "framework": "pytest",
+        "coverage": "comprehensive",
+    },
+}
+
+_TOOL_TEMPLATES = {
+    "generate_code": """Generate {language} code based on this specification:
 
-            return ReadResourceResult(
-                contents=[
-                    TextResourceContents(  # type: ignore
-                        text=content
-                    )
-                ]
+{specification}
+
+Requirements:
+- Use {style} coding style
+- Include appropriate comments
+- Follow best practices for {language}
+- Make the code production-ready
+- Include error handling where appropriate
+
+Generate only the code, no explanations.""",
+    "refactor_code": """Refactor this {language} code with focus on {goal}:
+
+Original code:
+```{language}
+{code}
+```
+
+Refactoring goals:
+- Improve {goal}
+- Maintain functionality
+- Follow {language} best practices
+- Add improvements where beneficial
+
+Provide the refactored code with comments explaining the changes.""",
+    "debug_code": """Help debug this code issue:
+
+Code:
+```
+{code}
+```
+
+Error: {error}
+
+Context: {context}
+
+Please:
+1. Identify the root cause of the issue
+2. Explain why the error is occurring
+3. Provide a fixed version of the code
+4. Suggest preventive measures for similar issues""",
+    "optimize_performance": """Analyze and optimize this code for performance:
+
+Code:
+```
+{code}
+```
+
+Known bottleneck: {bottleneck}
+Constraints: {constraints}
+
+Please:
+1. Identify performance issues
+2. Suggest optimization strategies
+3. Provide optimized code
+4. Explain the performance improvements
+5. Mention any trade-offs""",
+    "generate_tests": """Generate {coverage} unit tests for this code using {framework}:
+
+Code to test:
+```
+{code}
+```
+
+Test requirements:
+- Use {framework} framework
+- {coverage} test coverage
+- Test both positive and negative cases
+- Include edge cases
+- Add appropriate assertions
+- Follow testing best practices
+
+Generate complete test code that can be run immediately.""",
+}
+
+
+def _make_prompt_builder(template: str, defaults: Dict[str, str]):
+    """Bind one tool's template and defaults into a prompt-builder closure."""
+
+    def build(arguments: Dict[str, Any]) -> str:
+        return template.format_map({**defaults, **arguments})
+
+    return build
+
+
+# Keys are interned so dict lookups against names the transport layer has
+# also interned can short-circuit on identity before a full string compare.
+_TOOL_HANDLERS = {
+    sys.intern(name): _make_prompt_builder(template, _TOOL_DEFAULTS[name])
+    for name, template in _TOOL_TEMPLATES.items()
+}
+
+
+# The list-* payloads are materialized once and shared across requests; the
+# SDK treats them as read-only. MCP_SAFE_COPY=1 returns a fresh shallow copy
+# per call for defensive deployments.
+_SAFE_COPY = os.environ.get("MCP_SAFE_COPY") == "1"
+
+
+@functools.cache
+def _prompts_payload() -> List[Prompt]:
+    return list(_PROMPTS)
+
+
+@functools.cache
+def _tools_payload() -> List[Tool]:
+    return list(_TOOLS)
+
+
+@functools.cache
+def _resources_payload() -> List[Resource]:
+    return list(_RESOURCES)
+
+
+# Opt-in fast path for prompt responses: model_construct skips pydantic
+# validation, which dominates response-model cost. The field values come from
+# our own static templates, so validation adds nothing; fresh objects are
+# built per call either way to avoid sharing mutable models.
+_FAST_MODELS = os.environ.get("MCP_POC_FAST_MODELS") == "1"
+
+
+def _build_prompt_result(
+    description: str, text: str, fast: Optional[bool] = None
+) -> GetPromptResult:
+    """Assemble a GetPromptResult, optionally bypassing model validation."""
+    if fast if fast is not None else _FAST_MODELS:
+        return GetPromptResult.model_construct(
+            description=description,
+            messages=[
+                PromptMessage.model_construct(
+                    role="user",
+                    content=TextContent.model_construct(
+                        type="text", text=text
+                    ),
+                )
+            ],
+        )
+    return GetPromptResult(
+        description=description,
+        messages=[
+            PromptMessage(
+                role="user",
+                content=TextContent(type="text", text=text),
             )
+        ],
+    )
+
+
+async def _dispatch(name: str, arguments: Optional[Dict[str, Any]]) -> str:
+    """Build one tool prompt and resolve it; shared by single and batch paths."""
+    try:
+        build = _TOOL_HANDLERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown tool: {name}") from None
+    prompt = build(arguments or {})
+    return await asyncio.to_thread(_complete, prompt)
+
+
+
+_COMPLETION_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_COMPLETION_CACHE_SIZE = 1024
+# _complete runs via asyncio.to_thread and batch_tools gathers several such
+# calls, so cache mutations need the lock (as in standalone_server).
+_completion_cache_lock = threading.Lock()
+
+# Fail fast while OpenAI is degraded instead of queueing doomed calls
+# behind full-length timeouts; retries back off with jitter so a fleet of
+# servers doesn't re-hammer the API in lockstep.
+_breaker = CircuitBreaker(fail_max=5, reset_timeout=30.0)
+_MAX_ATTEMPTS = 4
+
+
+def _guarded_completion(prompt: str, on_delta=None) -> str:
+    """Run _stream_completion behind the circuit breaker with backoff."""
+    from openai import APIStatusError, RateLimitError
+
+    for attempt in range(_MAX_ATTEMPTS):
+        if not _breaker.allow():
+            raise CircuitBreakerOpen(
+                "OpenAI circuit open; retry in a few seconds"
+            )
+        try:
+            text = _stream_completion(prompt, on_delta)
+        except RateLimitError as e:
+            _breaker.record_failure()
+            if attempt == _MAX_ATTEMPTS - 1:
+                raise
+            delay = retry_after_seconds(e)
+            if delay is None:
+                delay = min(2.0**attempt + random.random(), 30.0)
+            time.sleep(delay)
+        except APIStatusError as e:
+            _breaker.record_failure()
+            if e.status_code < 500 or attempt == _MAX_ATTEMPTS - 1:
+                raise
+            time.sleep(min(2.0**attempt + random.random(), 30.0))
+        else:
+            _breaker.record_success()
+            return text
+
+
+def _stream_completion(prompt: str, on_delta=None) -> str:
+    """Run one streamed gpt-4o completion, forwarding deltas as they arrive."""
+    client = openai_client.get_client()
+    stream = client.chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.3,
+        stream=True,
+    )
+    parts = []
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            if on_delta is not None:
+                on_delta(delta)
+    return "".join(parts) or "No response generated"
+
+
+def _complete(prompt: str, on_delta=None) -> str:
+    """Resolve a tool prompt through the exact and semantic cache tiers.
+
+    Identical prompts are served from an in-memory LRU; misses stream from
+    the API (reporting partial output via on_delta) before being cached.
+    """
+    if _semantic_cache is not None:
+        hit = _semantic_cache.lookup(prompt)
+        if hit is not None:
+            return hit
+    with _completion_cache_lock:
+        cached = _COMPLETION_CACHE.get(prompt)
+        if cached is not None:
+            _COMPLETION_CACHE.move_to_end(prompt)
+    if cached is not None:
+        return cached
+
+    text = _guarded_completion(prompt, on_delta)
+    with _completion_cache_lock:
+        _COMPLETION_CACHE[prompt] = text
+        _COMPLETION_CACHE.move_to_end(prompt)
+        while len(_COMPLETION_CACHE) > _COMPLETION_CACHE_SIZE:
+            _COMPLETION_CACHE.popitem(last=False)
+    if _semantic_cache is not None:
+        _semantic_cache.store(prompt, text)
+    return text
+
+
+class MCPAIServer:
+    """MCP Server that provides AI-powered tools and resources."""
+
+    def __init__(self):
+        self.server = Server("mcp-ai-poc")
+        self.setup_handlers()
+
+    async def _complete_with_progress(self, prompt: str) -> str:
+        """Run _complete, relaying streamed deltas as progress notifications.
+
+        When the client supplied a progressToken, each delta is forwarded via
+        notifications/progress so first tokens surface in hundreds of ms; the
+        full text is still returned in the final CallToolResult.
+        """
+        try:
+            ctx = self.server.request_context
+            session = ctx.session
+            token = ctx.meta.progressToken if ctx.meta else None
+        except LookupError:
+            session = token = None
+
+        if session is None or token is None:
+            return await asyncio.to_thread(_complete, prompt)
+
+        loop = asyncio.get_running_loop()
+        sent = 0
+
+        def on_delta(delta: str):
+            nonlocal sent
+            sent += len(delta)
+            asyncio.run_coroutine_threadsafe(
+                session.send_progress_notification(token, sent, message=delta),
+                loop,
+            )
+
+        return await asyncio.to_thread(_complete, prompt, on_delta)
+
+    def setup_handlers(self):
+        """Set up all MCP protocol handlers."""
+
+        @self.server.list_prompts()
+        async def handle_list_prompts() -> List[Prompt]:
+            """List available prompts."""
+            payload = _prompts_payload()
+            return list(payload) if _SAFE_COPY else payload
+
+        @self.server.get_prompt()
+        async def handle_get_prompt(
+            name: str, arguments: Optional[Dict[str, str]] = None
+        ) -> GetPromptResult:
+            """Get a specific prompt."""
+            try:
+                template, description, defaults = _PROMPT_TEMPLATES[name]
+            except KeyError:
+                raise ValueError(f"Unknown prompt: {name}") from None
+
+            merged = {**defaults, **(arguments or {})}
+            return _build_prompt_result(
+                description.format_map(merged), template.format_map(merged)
+            )
+
+        @self.server.list_tools()
+        async def handle_list_tools() -> List[Tool]:
+            """List available tools."""
+            payload = _tools_payload()
+            return list(payload) if _SAFE_COPY else payload
+
+        @self.server.call_tool()  # type: ignore
+        async def handle_call_tool(
+            name: str, arguments: Optional[Dict[str, Any]] = None
+        ) -> CallToolResult:
+            """Handle tool calls."""
+            try:
+                if name == "batch_tools":
+                    calls = (arguments or {}).get("calls", [])
+                    texts = await asyncio.gather(
+                        *[
+                            _dispatch(c["name"], c.get("arguments"))
+                            for c in calls
+                        ]
+                    )
+                    return CallToolResult(
+                        content=[
+                            TextContent(type="text", text=t) for t in texts
+                        ]
+                    )
+
+                try:
+                    build = _TOOL_HANDLERS[name]
+                except KeyError:
+                    raise ValueError(f"Unknown tool: {name}") from None
+
+                prompt = build(arguments or {})
+                text = await self._complete_with_progress(prompt)
+                return CallToolResult(
+                    content=[TextContent(type="text", text=text)]
+                )
+
+            except Exception as e:
+                logger.error("Error in tool %s: %s", name, e)
+                return CallToolResult(
+                    content=[TextContent(type="text", text=f"Error: {str(e)}")],
+                    isError=True,
+                )
+
+        @self.server.list_resources()  # type: ignore
+        async def handle_list_resources() -> List[Resource]:
+            """List available resources."""
+            payload = _resources_payload()
+            return list(payload) if _SAFE_COPY else payload
+
+        @self.server.read_resource()  # type: ignore
+        async def handle_read_resource(uri: str) -> ReadResourceResult:
+            """Read a specific resource."""
+            try:
+                # The SDK hands us an AnyUrl; normalize to str so the dict
+                # lookup hits the interned keys.
+                return _RESOURCE_RESULTS[str(uri)]
+            except KeyError:
+                raise ValueError(f"Unknown resource: {uri}") from None
+
+
+async def _warmup():
+    """Pre-pay cold-start costs before the first tool call arrives.
+
+    Importing the chat-completion response models builds their pydantic
+    classes up front, and a cheap models.retrieve primes DNS, the TLS
+    handshake, and a keep-alive socket. Failures only cost the warmup.
+    """
+    try:
+        import openai.types.chat.chat_completion  # noqa: F401
+
+        await asyncio.wait_for(
+            asyncio.to_thread(
+                lambda: openai_client.get_client().models.retrieve("gpt-4o")
+            ),
+            timeout=3.0,
+        )
+    except Exception as e:
+        logger.warning("Warmup skipped: %s", e)
 
 
 async def main():
     """Main entry point for the MCP server."""
     try:
         server_instance = MCPAIServer()
+        await _warmup()
 
         # Run the server using stdio transport
         async with stdio_server() as (read_stream, write_stream):
@@ -729,9 +939,12 @@ async def main():
                 server_instance.server.create_initialization_options(),
             )
     except Exception as e:
-        logger.error(f"Failed to start server: {e}")
+        logger.error("Failed to start server: %s", e)
         sys.exit(1)
+    finally:
+        await openai_client.aclose()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     asyncio.run(main())
@@ -0,0 +1,122 @@
+"""
+Client-side token-bucket rate limiting for OpenAI calls.
+
+A proactive pacer keeps bursts (e.g. the fan-out helpers) under the account's
+RPM/TPM ceilings instead of relying on reactive 429 retries, each of which
+wastes a full round-trip. When a 429 does arrive, the bucket can be drained
+for exactly the server-provided Retry-After interval.
+"""
+
+import asyncio
+import threading
+import time
+
+
+class RateLimiter:
+    """Token bucket: `rate` tokens refill per second up to a `burst` cap.
+
+    Works for both request pacing (cost=1 per call) and token pacing
+    (cost=tokens per call). Thread-safe; usable from sync and async code.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self, cost: float) -> float:
+        """Take cost tokens; return seconds to wait before proceeding."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= cost
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def wait_for_token(self, cost: float = 1.0):
+        """Block until the bucket can afford `cost`."""
+        delay = self._reserve(cost)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def await_token(self, cost: float = 1.0):
+        """Async variant of wait_for_token."""
+        delay = self._reserve(cost)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def penalize(self, seconds: float):
+        """Drain the bucket so the next caller waits `seconds`.
+
+        Used after a 429 so pacing resumes exactly when the server says.
+        """
+        with self._lock:
+            self._tokens = -seconds * self.rate
+            self._updated = time.monotonic()
+
+
+class CircuitBreakerOpen(RuntimeError):
+    """Raised when a call is refused because the circuit is open."""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    After `fail_max` consecutive failures the circuit opens and `allow()`
+    returns False, so callers fail fast instead of paying a doomed round
+    trip. Once `reset_timeout` seconds pass, one trial call is let through
+    (half-open); a success closes the circuit, a failure re-opens it.
+    Thread-safe like RateLimiter.
+    """
+
+    def __init__(self, fail_max: int = 5, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed right now."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: permit one trial; re-arm the timer so further
+                # callers keep failing fast until the trial resolves.
+                self._opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        """Close the circuit after a successful call."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at fail_max."""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+
+def retry_after_seconds(exc):
+    """Extract a Retry-After interval from an API error, if present."""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -0,0 +1,153 @@
+"""
+Semantic (embedding-similarity) cache for chat completions.
+
+Exact-match caching misses trivially reworded prompts. This cache embeds the
+last user message, compares it against previously answered prompts by cosine
+similarity, and returns the stored completion when the similarity clears a
+threshold — turning paraphrased repeats into zero-token responses.
+
+Vectors are kept in a plain normalized list and scanned with a dot product;
+at POC scale (hundreds of entries) this beats pulling in a vector-index
+dependency. The index is persisted to disk as JSON on shutdown.
+"""
+
+import atexit
+import hashlib
+import json
+import math
+import os
+import threading
+
+from .ai_tools import OpenAIClient
+from .cache import DEFAULT_CACHE_DIR, DiskCache
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+DEFAULT_THRESHOLD = 0.95
+DEFAULT_INDEX_PATH = os.path.join(DEFAULT_CACHE_DIR, "semantic_index.json")
+EMBEDDING_CACHE_PATH = os.path.join(DEFAULT_CACHE_DIR, "embeddings.db")
+
+# On-disk embedding cache shared across sessions; embeddings are stable for
+# a given model so the TTL is generous.
+_embedding_cache = DiskCache(EMBEDDING_CACHE_PATH, ttl=30 * 24 * 3600)
+_default_client = OpenAIClient()
+
+
+def _embedding_key(text: str) -> str:
+    """Truncated SHA-256 key for an embedding cache entry."""
+    return hashlib.sha256(text.encode()).hexdigest()[:32]
+
+
+def embed_texts(texts: list, client_provider=None) -> list:
+    """Embed texts, serving repeats from the on-disk cache.
+
+    Misses are collected and embedded with a single batched
+    embeddings.create call. Cache failures degrade gracefully to the
+    uncached path rather than breaking the lookup.
+    """
+    get_client = client_provider or _default_client.get_client
+    keys = [_embedding_key(t) for t in texts]
+    try:
+        cached = [_embedding_cache.get(k) for k in keys]
+    except Exception:
+        cached = [None] * len(keys)
+
+    vectors = [json.loads(c) if c is not None else None for c in cached]
+    missing = [i for i, v in enumerate(vectors) if v is None]
+    if missing:
+        response = get_client().embeddings.create(
+            model=EMBEDDING_MODEL, input=[texts[i] for i in missing]
+        )
+        for i, item in zip(missing, response.data):
+            vectors[i] = item.embedding
+            try:
+                _embedding_cache.set(keys[i], json.dumps(item.embedding))
+            except Exception:
+                pass
+    return vectors
+
+
+def _normalize(vector: list) -> list:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        return vector
+    return [v / norm for v in vector]
+
+
+class SemanticCache:
+    """Similarity cache mapping embedded prompts to stored completions."""
+
+    def __init__(
+        self,
+        client_provider,
+        path: str = DEFAULT_INDEX_PATH,
+        threshold: float = DEFAULT_THRESHOLD,
+    ):
+        self._get_client = client_provider
+        self.path = path
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        # Parallel lists: normalized embeddings and their completions.
+        self._vectors: list = []
+        self._completions: list = []
+        # Embeddings memoized by text hash so repeated lookups don't re-embed.
+        self._embedding_memo: dict = {}
+        self._load()
+        atexit.register(self.save)
+
+    def _embed(self, text: str) -> list:
+        """Embed text, memoizing by SHA-256 so repeats are free."""
+        key = hashlib.sha256(text.encode()).hexdigest()
+        cached = self._embedding_memo.get(key)
+        if cached is not None:
+            return cached
+        vector = _normalize(embed_texts([text], self._get_client)[0])
+        self._embedding_memo[key] = vector
+        return vector
+
+    def lookup(self, text: str):
+        """Return a cached completion for a semantically similar prompt.
+
+        Returns None when nothing clears the similarity threshold.
+        """
+        with self._lock:
+            if not self._vectors:
+                return None
+        query = self._embed(text)
+        with self._lock:
+            best_score, best_index = -1.0, -1
+            for i, vector in enumerate(self._vectors):
+                score = sum(q * v for q, v in zip(query, vector))
+                if score > best_score:
+                    best_score, best_index = score, i
+            if best_score > self.threshold:
+                return self._completions[best_index]
+        return None
+
+    def store(self, text: str, completion: str):
+        """Index a (prompt, completion) pair for future lookups."""
+        vector = self._embed(text)
+        with self._lock:
+            self._vectors.append(vector)
+            self._completions.append(completion)
+
+    def save(self):
+        """Persist the index to disk."""
+        with self._lock:
+            if not self._vectors:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w") as f:
+                json.dump(
+                    {"vectors": self._vectors, "completions": self._completions}, f
+                )
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            self._vectors = data.get("vectors", [])
+            self._completions = data.get("completions", [])
+        except (OSError, ValueError):
+            # Missing or corrupt index: start empty.
+            self._vectors = []
+            self._completions = []
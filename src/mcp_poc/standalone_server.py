@@ -4,132 +4,70 @@ This provides a complete MCP server without requiring the mcp package.
 """
 
 import asyncio
+import functools
 import json
 import logging
+import re
 import sys
+import threading
+from collections import OrderedDict
 from typing import Any, Dict
 from .ai_tools import OpenAIClient
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
 
-# Global OpenAI client
-openai_client = OpenAIClient()
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - CBOR framing is opt-in
+    cbor2 = None
 
+# JSON framing is the dominant per-request CPU cost after the LLM call
+# itself; orjson parses and emits in C. Both helpers deal in bytes so the
+# stdout path can write without an intermediate str.
+if orjson is not None:
+    _loads = orjson.loads
 
-class JSONRPCServer:
-    """Simple JSON-RPC server for MCP protocol."""
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
 
-    def __init__(self, server_name: str = "mcp-ai-poc"):
-        self.server_name = server_name
-        self.handlers = {}
-        self.setup_handlers()
+else:
+    _loads = json.loads
 
-    def setup_handlers(self):
-        """Set up MCP protocol handlers."""
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
-        # Initialize handler
-        self.handlers["initialize"] = self.handle_initialize
+# Responses go straight to the byte stream: one handle lookup at import,
+# no per-response TextIOWrapper encode and no print() machinery. The lock
+# keeps frames atomic now that streaming notifications can be written from
+# worker threads while the loop writes responses.
+_OUT = sys.stdout.buffer
+_write_lock = threading.Lock()
 
-        # Capability handlers
-        self.handlers["prompts/list"] = self.handle_list_prompts
-        self.handlers["prompts/get"] = self.handle_get_prompt
-        self.handlers["tools/list"] = self.handle_list_tools
-        self.handlers["tools/call"] = self.handle_call_tool
-        self.handlers["resources/list"] = self.handle_list_resources
-        self.handlers["resources/read"] = self.handle_read_resource
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
 
-    async def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle initialization request."""
-        return {
-            "protocolVersion": "2024-11-05",
-            "serverInfo": {"name": self.server_name, "version": "1.0.0"},
-            "capabilities": {
-                "prompts": {"listChanged": False},
-                "tools": {"listChanged": False},
-                "resources": {"listChanged": False, "subscribe": False},
-            },
-        }
+# Global OpenAI client, constructed on first tools/call. Deferring it keeps
+# server cold-start free of SDK setup and lets prompts/resources handlers
+# work with no OPENAI_API_KEY configured.
+openai_client = None
 
-    async def handle_list_prompts(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List available prompts."""
-        return {
-            "prompts": [
-                {
-                    "name": "analyze_code",
-                    "description": "Analyze code for quality, security, and best practices",
-                    "arguments": [
-                        {
-                            "name": "code",
-                            "description": "The code to analyze",
-                            "required": True,
-                        },
-                        {
-                            "name": "language",
-                            "description": "Programming language of the code",
-                            "required": False,
-                        },
-                    ],
-                },
-                {
-                    "name": "generate_documentation",
-                    "description": "Generate comprehensive documentation for code",
-                    "arguments": [
-                        {
-                            "name": "code",
-                            "description": "The code to document",
-                            "required": True,
-                        },
-                        {
-                            "name": "style",
-                            "description": "Documentation style (e.g., 'sphinx', 'google', 'numpy')",
-                            "required": False,
-                        },
-                    ],
-                },
-                {
-                    "name": "code_review",
-                    "description": "Perform a comprehensive code review",
-                    "arguments": [
-                        {
-                            "name": "code",
-                            "description": "The code to review",
-                            "required": True,
-                        },
-                        {
-                            "name": "focus",
-                            "description": "Review focus (e.g., 'security', 'performance', 'maintainability')",
-                            "required": False,
-                        },
-                    ],
-                },
-                {
-                    "name": "explain_concept",
-                    "description": "Explain programming concepts or technologies",
-                    "arguments": [
-                        {
-                            "name": "concept",
-                            "description": "The concept to explain",
-                            "required": True,
-                        },
-                        {
-                            "name": "level",
-                            "description": "Explanation level (e.g., 'beginner', 'intermediate', 'advanced')",
-                            "required": False,
-                        },
-                    ],
-                },
-            ]
-        }
 
-    async def handle_get_prompt(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Get a specific prompt."""
-        name = params.get("name", "")
-        arguments = params.get("arguments", {})
+def _get_oai() -> OpenAIClient:
+    """Return the shared OpenAIClient, constructing it on first use."""
+    global openai_client
+    if openai_client is None:
+        openai_client = OpenAIClient()
+    return openai_client
 
-        prompt_templates = {
-            "analyze_code": """Analyze the following {language} code for:
+# Prompt templates are parsed once at import: each source template is split
+# into alternating literal/key segments so rendering is a str.join over a
+# list instead of str.format's per-call field parser.
+_PROMPT_SOURCES = {
+    "analyze_code": """Analyze the following {language} code for:
 1. Code quality and best practices
 2. Potential bugs or issues
 3. Security vulnerabilities
@@ -142,7 +80,7 @@ Code to analyze:
 ```
 
 Provide a detailed analysis with specific recommendations for improvement.""",
-            "generate_documentation": """Generate comprehensive documentation for the following code using {style} style:
+    "generate_documentation": """Generate comprehensive documentation for the following code using {style} style:
 
 Code:
 ```
@@ -157,7 +95,7 @@ Include:
 5. Exception handling information
 
 Use {style} documentation format.""",
-            "code_review": """Perform a comprehensive code review with focus on {focus}:
+    "code_review": """Perform a comprehensive code review with focus on {focus}:
 
 Code to review:
 ```
@@ -175,7 +113,7 @@ Review criteria:
 Focus area: {focus}
 
 Provide constructive feedback with specific suggestions for improvement.""",
-            "explain_concept": """Explain the programming concept "{concept}" at a {level} level.
+    "explain_concept": """Explain the programming concept "{concept}" at a {level} level.
 
 Include:
 1. Clear definition and explanation
@@ -186,379 +124,250 @@ Include:
 6. Related concepts
 
 Tailor the explanation to a {level} audience.""",
-        }
-
-        if name not in prompt_templates:
-            raise ValueError(f"Unknown prompt: {name}")
-
-        # Fill in template with arguments
-        template = prompt_templates[name]
-        code = arguments.get("code", "")
-        language = arguments.get("language", "unknown")
-        style = arguments.get("style", "google")
-        focus = arguments.get("focus", "general")
-        concept = arguments.get("concept", "")
-        level = arguments.get("level", "intermediate")
-
-        prompt_text = template.format(
-            code=code,
-            language=language,
-            style=style,
-            focus=focus,
-            concept=concept,
-            level=level,
-        )
-
-        return {
-            "description": f"Generated prompt for {name}",
-            "messages": [
-                {"role": "user", "content": {"type": "text", "text": prompt_text}}
-            ],
-        }
-
-    async def handle_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List available tools."""
-        return {
-            "tools": [
+}
+
+_PROMPT_DEFAULTS = {
+    "analyze_code": {"code": "", "language": "unknown"},
+    "generate_documentation": {"code": "", "style": "google"},
+    "code_review": {"code": "", "focus": "general"},
+    "explain_concept": {"concept": "", "level": "intermediate"},
+}
+
+_TEMPLATE_FIELD = re.compile(r"\{(\w+)\}")
+
+# re.split leaves keys at odd indices and literals at even ones.
+_PROMPT_TEMPLATES = {
+    name: _TEMPLATE_FIELD.split(template)
+    for name, template in _PROMPT_SOURCES.items()
+}
+
+
+
+# Static protocol payloads, built once at import. The list handlers return
+# these shared dicts, and _STATIC_RESULT_BYTES holds their serialized form so
+# run() can splice them into the response envelope without re-walking the
+# dicts per request.
+_PROMPTS_RESULT = {
+    "prompts": [
+        {
+            "name": "analyze_code",
+            "description": "Analyze code for quality, security, and best practices",
+            "arguments": [
                 {
-                    "name": "generate_code",
-                    "description": "Generate code based on specifications",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "specification": {
-                                "type": "string",
-                                "description": "Description of what code to generate",
-                            },
-                            "language": {
-                                "type": "string",
-                                "description": "Programming language for the code",
-                                "default": "python",
-                            },
-                            "style": {
-                                "type": "string",
-                                "description": "Coding style or framework to use",
-                                "default": "clean",
-                            },
-                        },
-                        "required": ["specification"],
-                    },
+                    "name": "code",
+                    "description": "The code to analyze",
+                    "required": True,
                 },
                 {
-                    "name": "refactor_code",
-                    "description": "Refactor existing code for better quality",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code to refactor",
-                            },
-                            "goal": {
-                                "type": "string",
-                                "description": "Refactoring goal (e.g., 'performance', 'readability', 'maintainability')",
-                                "default": "maintainability",
-                            },
-                            "language": {
-                                "type": "string",
-                                "description": "Programming language of the code",
-                                "default": "python",
-                            },
-                        },
-                        "required": ["code"],
-                    },
+                    "name": "language",
+                    "description": "Programming language of the code",
+                    "required": False,
                 },
+            ],
+        },
+        {
+            "name": "generate_documentation",
+            "description": "Generate comprehensive documentation for code",
+            "arguments": [
                 {
-                    "name": "debug_code",
-                    "description": "Help debug code issues and find solutions",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code with issues",
-                            },
-                            "error": {
-                                "type": "string",
-                                "description": "Error message or description of the problem",
-                            },
-                            "context": {
-                                "type": "string",
-                                "description": "Additional context about when the error occurs",
-                            },
-                        },
-                        "required": ["code", "error"],
-                    },
+                    "name": "code",
+                    "description": "The code to document",
+                    "required": True,
                 },
                 {
-                    "name": "optimize_performance",
-                    "description": "Analyze and optimize code performance",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code to optimize",
-                            },
-                            "bottleneck": {
-                                "type": "string",
-                                "description": "Known performance bottleneck or area of concern",
-                            },
-                            "constraints": {
-                                "type": "string",
-                                "description": "Performance constraints or requirements",
-                            },
-                        },
-                        "required": ["code"],
-                    },
+                    "name": "style",
+                    "description": "Documentation style (e.g., 'sphinx', 'google', 'numpy')",
+                    "required": False,
                 },
+            ],
+        },
+        {
+            "name": "code_review",
+            "description": "Perform a comprehensive code review",
+            "arguments": [
                 {
-                    "name": "generate_tests",
-                    "description": "Generate unit tests for given code",
-                    "inputSchema": {
-                        "type": "object",
-                        "properties": {
-                            "code": {
-                                "type": "string",
-                                "description": "The code to generate tests for",
-                            },
-                            "framework": {
-                                "type": "string",
-                                "description": "Testing framework to use (e.g., 'pytest', 'unittest', 'jest')",
-                                "default": "pytest",
-                            },
-                            "coverage": {
-                                "type": "string",
-                                "description": "Desired test coverage level",
-                                "default": "comprehensive",
-                            },
-                        },
-                        "required": ["code"],
-                    },
+                    "name": "code",
+                    "description": "The code to review",
+                    "required": True,
                 },
-            ]
-        }
-
-    async def handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle tool calls."""
-        name = params.get("name", "")
-        arguments = params.get("arguments", {})
-
-        try:
-            client = openai_client.get_client()
-
-            # Tool implementations
-            if name == "generate_code":
-                specification = arguments.get("specification", "")
-                language = arguments.get("language", "python")
-                style = arguments.get("style", "clean")
-
-                prompt = f"""Generate {language} code based on this specification:
-
-{specification}
-
-Requirements:
-- Use {style} coding style
-- Include appropriate comments
-- Follow best practices for {language}
-- Make the code production-ready
-- Include error handling where appropriate
-
-Generate only the code, no explanations."""
-
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                )
-
-                return {
-                    "content": [
-                        {"type": "text", "text": response.choices[0].message.content}
-                    ]
-                }
-
-            elif name == "refactor_code":
-                code = arguments.get("code", "")
-                goal = arguments.get("goal", "maintainability")
-                language = arguments.get("language", "python")
-
-                prompt = f"""Refactor this {language} code with focus on {goal}:
-
-Original code:
-```{language}
-{code}
-```
-
-Refactoring goals:
-- Improve {goal}
-- Maintain functionality
-- Follow {language} best practices
-- Add improvements where beneficial
-
-Provide the refactored code with comments explaining the changes."""
-
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                )
-
-                return {
-                    "content": [
-                        {"type": "text", "text": response.choices[0].message.content}
-                    ]
-                }
-
-            elif name == "debug_code":
-                code = arguments.get("code", "")
-                error = arguments.get("error", "")
-                context = arguments.get("context", "")
-
-                prompt = f"""Help debug this code issue:
-
-Code:
-```
-{code}
-```
-
-Error: {error}
-
-Context: {context}
-
-Please:
-1. Identify the root cause of the issue
-2. Explain why the error is occurring
-3. Provide a fixed version of the code
-4. Suggest preventive measures for similar issues"""
-
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                )
-
-                return {
-                    "content": [
-                        {"type": "text", "text": response.choices[0].message.content}
-                    ]
-                }
-
-            elif name == "optimize_performance":
-                code = arguments.get("code", "")
-                bottleneck = arguments.get("bottleneck", "")
-                constraints = arguments.get("constraints", "")
-
-                prompt = f"""Analyze and optimize this code for performance:
-
-Code:
-```
-{code}
-```
-
-Known bottleneck: {bottleneck}
-Constraints: {constraints}
-
-Please:
-1. Identify performance issues
-2. Suggest optimization strategies
-3. Provide optimized code
-4. Explain the performance improvements
-5. Mention any trade-offs"""
-
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                )
-
-                return {
-                    "content": [
-                        {"type": "text", "text": response.choices[0].message.content}
-                    ]
-                }
-
-            elif name == "generate_tests":
-                code = arguments.get("code", "")
-                framework = arguments.get("framework", "pytest")
-                coverage = arguments.get("coverage", "comprehensive")
-
-                prompt = f"""Generate {coverage} unit tests for this code using {framework}:
-
-Code to test:
-```
-{code}
-```
-
-Test requirements:
-- Use {framework} framework
-- {coverage} test coverage
-- Test both positive and negative cases
-- Include edge cases
-- Add appropriate assertions
-- Follow testing best practices
-
-Generate complete test code that can be run immediately."""
-
-                response = client.chat.completions.create(
-                    model="gpt-4o",
-                    messages=[{"role": "user", "content": prompt}],
-                    temperature=0.3,
-                )
-
-                return {
-                    "content": [
-                        {"type": "text", "text": response.choices[0].message.content}
-                    ]
-                }
-
-            else:
-                raise ValueError(f"Unknown tool: {name}")
-
-        except Exception as e:
-            logger.error(f"Error in tool {name}: {e}")
-            return {
-                "content": [{"type": "text", "text": f"Error: {str(e)}"}],
-                "isError": True,
-            }
-
-    async def handle_list_resources(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """List available resources."""
-        return {
-            "resources": [
                 {
-                    "uri": "coding-guidelines://python",
-                    "name": "Python Coding Guidelines",
-                    "description": "Comprehensive Python coding best practices and guidelines",
-                    "mimeType": "text/markdown",
+                    "name": "focus",
+                    "description": "Review focus (e.g., 'security', 'performance', 'maintainability')",
+                    "required": False,
                 },
+            ],
+        },
+        {
+            "name": "explain_concept",
+            "description": "Explain programming concepts or technologies",
+            "arguments": [
                 {
-                    "uri": "patterns://design-patterns",
-                    "name": "Design Patterns Reference",
-                    "description": "Common software design patterns with examples",
-                    "mimeType": "text/markdown",
+                    "name": "concept",
+                    "description": "The concept to explain",
+                    "required": True,
                 },
                 {
-                    "uri": "security://best-practices",
-                    "name": "Security Best Practices",
-                    "description": "Security guidelines for safe coding practices",
-                    "mimeType": "text/markdown",
+                    "name": "level",
+                    "description": "Explanation level (e.g., 'beginner', 'intermediate', 'advanced')",
+                    "required": False,
                 },
-                {
-                    "uri": "performance://optimization-guide",
-                    "name": "Performance Optimization Guide",
-                    "description": "Techniques and strategies for code optimization",
-                    "mimeType": "text/markdown",
+            ],
+        },
+    ]
+}
+
+_TOOLS_RESULT = {
+    "tools": [
+        {
+            "name": "generate_code",
+            "description": "Generate code based on specifications",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "specification": {
+                        "type": "string",
+                        "description": "Description of what code to generate",
+                    },
+                    "language": {
+                        "type": "string",
+                        "description": "Programming language for the code",
+                        "default": "python",
+                    },
+                    "style": {
+                        "type": "string",
+                        "description": "Coding style or framework to use",
+                        "default": "clean",
+                    },
                 },
-            ]
-        }
-
-    async def handle_read_resource(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Read a specific resource."""
-        uri = params.get("uri", "")
-
-        resources = {
-            "coding-guidelines://python": """# Python Coding Guidelines
+                "required": ["specification"],
+            },
+        },
+        {
+            "name": "refactor_code",
+            "description": "Refactor existing code for better quality",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "The code to refactor",
+                    },
+                    "goal": {
+                        "type": "string",
+                        "description": "Refactoring goal (e.g., 'performance', 'readability', 'maintainability')",
+                        "default": "maintainability",
+                    },
+                    "language": {
+                        "type": "string",
+                        "description": "Programming language of the code",
+                        "default": "python",
+                    },
+                },
+                "required": ["code"],
+            },
+        },
+        {
+            "name": "debug_code",
+            "description": "Help debug code issues and find solutions",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "The code with issues",
+                    },
+                    "error": {
+                        "type": "string",
+                        "description": "Error message or description of the problem",
+                    },
+                    "context": {
+                        "type": "string",
+                        "description": "Additional context about when the error occurs",
+                    },
+                },
+                "required": ["code", "error"],
+            },
+        },
+        {
+            "name": "optimize_performance",
+            "description": "Analyze and optimize code performance",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "The code to optimize",
+                    },
+                    "bottleneck": {
+                        "type": "string",
+                        "description": "Known performance bottleneck or area of concern",
+                    },
+                    "constraints": {
+                        "type": "string",
+                        "description": "Performance constraints or requirements",
+                    },
+                },
+                "required": ["code"],
+            },
+        },
+        {
+            "name": "generate_tests",
+            "description": "Generate unit tests for given code",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "code": {
+                        "type": "string",
+                        "description": "The code to generate tests for",
+                    },
+                    "framework": {
+                        "type": "string",
+                        "description": "Testing framework to use (e.g., 'pytest', 'unittest', 'jest')",
+                        "default": "pytest",
+                    },
+                    "coverage": {
+                        "type": "string",
+                        "description": "Desired test coverage level",
+                        "default": "comprehensive",
+                    },
+                },
+                "required": ["code"],
+            },
+        },
+    ]
+}
+
+_RESOURCES_RESULT = {
+    "resources": [
+        {
+            "uri": "coding-guidelines://python",
+            "name": "Python Coding Guidelines",
+            "description": "Comprehensive Python coding best practices and guidelines",
+            "mimeType": "text/markdown",
+        },
+        {
+            "uri": "patterns://design-patterns",
+            "name": "Design Patterns Reference",
+            "description": "Common software design patterns with examples",
+            "mimeType": "text/markdown",
+        },
+        {
+            "uri": "security://best-practices",
+            "name": "Security Best Practices",
+            "description": "Security guidelines for safe coding practices",
+            "mimeType": "text/markdown",
+        },
+        {
+            "uri": "performance://optimization-guide",
+            "name": "Performance Optimization Guide",
+            "description": "Techniques and strategies for code optimization",
+            "mimeType": "text/markdown",
+        },
+    ]
+}
+
+_RESOURCE_BODIES = {
+    "coding-guidelines://python": """# Python Coding Guidelines
 
 ## Code Style
 - Follow PEP 8 for style guidelines
@@ -584,7 +393,7 @@ Generate complete test code that can be run immediately."""
 - Use parameterized queries for database operations
 - Don't store secrets in code
 - Keep dependencies up to date""",
-            "patterns://design-patterns": """# Design Patterns Reference
+    "patterns://design-patterns": """# Design Patterns Reference
 
 ## Creational Patterns
 - **Singleton**: Ensure only one instance exists
@@ -603,7 +412,7 @@ Generate complete test code that can be run immediately."""
 
 ## When to Use
 Choose patterns based on the specific problem you're solving, not because they're popular.""",
-            "security://best-practices": """# Security Best Practices
+    "security://best-practices": """# Security Best Practices
 
 ## Input Validation
 - Validate all user inputs
@@ -630,7 +439,7 @@ Choose patterns based on the specific problem you're solving, not because they'r
 - Keep all dependencies updated
 - Use vulnerability scanners
 - Review third-party code""",
-            "performance://optimization-guide": """# Performance Optimization Guide
+    "performance://optimization-guide": """# Performance Optimization Guide
 
 ## Profiling
 - Measure before optimizing
@@ -656,62 +465,580 @@ Choose patterns based on the specific problem you're solving, not because they'r
 - Use async/await for I/O-bound operations
 - Consider multiprocessing for CPU-bound tasks
 - Be aware of GIL limitations in Python""",
+}
+
+# Read results are fixed per URI: build the wrapper dicts and their
+# serialized forms once so a resources/read costs a lookup, not a ~3KB
+# string copy plus dict build plus re-serialization.
+_RESOURCE_PAYLOADS = {
+    uri: {"contents": [{"type": "text", "text": body}]}
+    for uri, body in _RESOURCE_BODIES.items()
+}
+
+_RESOURCE_RESULT_BYTES = {
+    uri: _dumps(payload) for uri, payload in _RESOURCE_PAYLOADS.items()
+}
+
+_STATIC_RESULT_BYTES = {
+    sys.intern("prompts/list"): _dumps(_PROMPTS_RESULT),
+    sys.intern("tools/list"): _dumps(_TOOLS_RESULT),
+    sys.intern("resources/list"): _dumps(_RESOURCES_RESULT),
+}
+
+
+def _static_response_bytes(request):
+    """Return a fully-framed response for static methods, or None."""
+    method = request.get("method")
+    payload = _STATIC_RESULT_BYTES.get(method)
+    if payload is None and method == "resources/read":
+        params = request.get("params")
+        if params:
+            payload = _RESOURCE_RESULT_BYTES.get(params.get("uri"))
+    if payload is None:
+        return None
+    return (
+        b'{"jsonrpc":"2.0","id":'
+        + _dumps(request.get("id"))
+        + b',"result":'
+        + payload
+        + b"}"
+    )
+
+
+
+# Per-tool prompt templates and defaults, dispatched from handle_call_tool
+# with one dict lookup. Arguments are applied in a single defaults merge per
+# call instead of repeated arguments.get probes.
+_TOOL_DEFAULTS = {
+    "generate_code": {
+        "specification": "",
+        "language": "python",
+        "style": "clean",
+    },
+    "refactor_code": {
+        "code": "",
+        "goal": "maintainability",
+        "language": "python",
+    },
+    "debug_code": {"code": "", "error": "", "context": ""},
+    "optimize_performance": {"code": "", "bottleneck": "", "constraints": ""},
+    "generate_tests": {
+        "code": "",
+        "framework": "pytest",
+        "coverage": "comprehensive",
+    },
+}
+
+_TOOL_TEMPLATE_SOURCES = {
+    "generate_code": """Generate {language} code based on this specification:
+
+{specification}
+
+Requirements:
+- Use {style} coding style
+- Include appropriate comments
+- Follow best practices for {language}
+- Make the code production-ready
+- Include error handling where appropriate
+
+Generate only the code, no explanations.""",
+    "refactor_code": """Refactor this {language} code with focus on {goal}:
+
+Original code:
+```{language}
+{code}
+```
+
+Refactoring goals:
+- Improve {goal}
+- Maintain functionality
+- Follow {language} best practices
+- Add improvements where beneficial
+
+Provide the refactored code with comments explaining the changes.""",
+    "debug_code": """Help debug this code issue:
+
+Code:
+```
+{code}
+```
+
+Error: {error}
+
+Context: {context}
+
+Please:
+1. Identify the root cause of the issue
+2. Explain why the error is occurring
+3. Provide a fixed version of the code
+4. Suggest preventive measures for similar issues""",
+    "optimize_performance": """Analyze and optimize this code for performance:
+
+Code:
+```
+{code}
+```
+
+Known bottleneck: {bottleneck}
+Constraints: {constraints}
+
+Please:
+1. Identify performance issues
+2. Suggest optimization strategies
+3. Provide optimized code
+4. Explain the performance improvements
+5. Mention any trade-offs""",
+    "generate_tests": """Generate {coverage} unit tests for this code using {framework}:
+
+Code to test:
+```
+{code}
+```
+
+Test requirements:
+- Use {framework} framework
+- {coverage} test coverage
+- Test both positive and negative cases
+- Include edge cases
+- Add appropriate assertions
+- Follow testing best practices
+
+Generate complete test code that can be run immediately.""",
+}
+
+
+def _make_tool_builder(template: str, defaults: Dict[str, str]):
+    """Bind one tool's pre-split template and defaults into a prompt builder.
+
+    The template is split once at import into literal/field segments (fields
+    at odd indices, as in _PROMPT_TEMPLATES), so each call is a defaults
+    merge plus one str.join with no per-call format parsing of the ~300
+    bytes of static text.
+    """
+    parts = _TEMPLATE_FIELD.split(template)
+
+    def build(arguments: Dict[str, Any]) -> str:
+        merged = {**defaults, **arguments}
+        return "".join(
+            merged[part] if i & 1 else part for i, part in enumerate(parts)
+        )
+
+    return build
+
+
+_TOOL_PROMPTS = {
+    sys.intern(name): _make_tool_builder(template, _TOOL_DEFAULTS[name])
+    for name, template in _TOOL_TEMPLATE_SOURCES.items()
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _oai_client():
+    """Resolve the shared OpenAI client once and pin the handle.
+
+    Deliberately lazy rather than bound in JSONRPCServer.__init__: the
+    server must be constructible without an API key (listing tools and
+    prompts needs no client), and get_client raises when the key is unset.
+    """
+    return _get_oai().get_client()
+
+
+# Explicit LRU dict rather than functools.lru_cache so the streaming path
+# can populate the same tier; completions run in worker threads, hence the
+# lock.
+_COMPLETION_CACHE: "OrderedDict[str, str]" = OrderedDict()
+_COMPLETION_CACHE_SIZE = 256
+_completion_cache_lock = threading.Lock()
+
+
+def _cache_lookup(prompt: str):
+    """Return the cached completion for prompt, refreshing its LRU slot."""
+    with _completion_cache_lock:
+        cached = _COMPLETION_CACHE.get(prompt)
+        if cached is not None:
+            _COMPLETION_CACHE.move_to_end(prompt)
+        return cached
+
+
+def _cache_store(prompt: str, text: str) -> None:
+    """Insert a completion, evicting least recently used past the cap."""
+    with _completion_cache_lock:
+        _COMPLETION_CACHE[prompt] = text
+        _COMPLETION_CACHE.move_to_end(prompt)
+        while len(_COMPLETION_CACHE) > _COMPLETION_CACHE_SIZE:
+            _COMPLETION_CACHE.popitem(last=False)
+
+
+def _cached_completion(prompt: str) -> str:
+    """Run one gpt-4o completion; identical prompts skip the network.
+
+    Synchronous; callers run it via asyncio.to_thread, which keeps
+    concurrent tool calls overlapping in the thread pool. Model and
+    temperature are constant, so the prompt alone is the cache key.
+    """
+    cached = _cache_lookup(prompt)
+    if cached is not None:
+        return cached
+    response = _oai_client().chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.3,
+    )
+    text = response.choices[0].message.content
+    _cache_store(prompt, text)
+    return text
+
+
+def _stream_completion(prompt: str, on_delta) -> str:
+    """Stream one gpt-4o completion, reporting each delta as it arrives.
+
+    Used instead of _cached_completion when the client asked for progress;
+    the joined text is stored in the same completion cache, so a later
+    non-progress call for the identical prompt is served locally.
+    """
+    cached = _cache_lookup(prompt)
+    if cached is not None:
+        # Replay the cached text as a single delta so the client still
+        # sees progress before the final response.
+        on_delta(cached)
+        return cached
+    stream = _oai_client().chat.completions.create(
+        model="gpt-4o",
+        messages=[{"role": "user", "content": prompt}],
+        temperature=0.3,
+        stream=True,
+    )
+    parts = []
+    for chunk in stream:
+        delta = chunk.choices[0].delta.content
+        if delta:
+            parts.append(delta)
+            on_delta(delta)
+    text = "".join(parts)
+    _cache_store(prompt, text)
+    return text
+
+
+class JSONRPCServer:
+    """Simple JSON-RPC server for MCP protocol."""
+
+    def __init__(self, server_name: str = "mcp-ai-poc"):
+        self.server_name = server_name
+        # "json" = newline-delimited JSON (default); "cbor" = length-prefixed
+        # CBOR, negotiated via the experimental cborFraming capability.
+        self.framing = "json"
+        # Keys are interned so lookups against method names the parser has
+        # also interned can short-circuit on identity before a full compare.
+        self.handlers = {
+            sys.intern("initialize"): self.handle_initialize,
+            sys.intern("prompts/list"): self.handle_list_prompts,
+            sys.intern("prompts/get"): self.handle_get_prompt,
+            sys.intern("tools/list"): self.handle_list_tools,
+            sys.intern("tools/call"): self.handle_call_tool,
+            sys.intern("resources/list"): self.handle_list_resources,
+            sys.intern("resources/read"): self.handle_read_resource,
+        }
+
+    async def handle_initialize(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle initialization request."""
+        experimental = params.get("capabilities", {}).get("experimental", {})
+        if cbor2 is not None and experimental.get("cborFraming"):
+            # Takes effect after the initialize response goes out as JSON.
+            self.framing = "cbor"
+
+        return {
+            "protocolVersion": "2024-11-05",
+            "serverInfo": {"name": self.server_name, "version": "1.0.0"},
+            "capabilities": {
+                "prompts": {"listChanged": False},
+                "tools": {"listChanged": False},
+                "resources": {"listChanged": False, "subscribe": False},
+                "experimental": {"cborFraming": cbor2 is not None},
+            },
+        }
+
+    async def handle_list_prompts(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """List available prompts."""
+        return _PROMPTS_RESULT
+
+    async def handle_get_prompt(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Get a specific prompt."""
+        name = params.get("name", "")
+        arguments = params.get("arguments", {})
+
+
+        if name not in _PROMPT_TEMPLATES:
+            raise ValueError(f"Unknown prompt: {name}")
+
+        # Render the pre-split template: odd segments are field names.
+        merged = {**_PROMPT_DEFAULTS[name], **arguments}
+        parts = _PROMPT_TEMPLATES[name]
+        prompt_text = "".join(
+            merged[part] if i & 1 else part for i, part in enumerate(parts)
+        )
+
+        return {
+            "description": f"Generated prompt for {name}",
+            "messages": [
+                {"role": "user", "content": {"type": "text", "text": prompt_text}}
+            ],
         }
 
-        if uri not in resources:
+    async def handle_list_tools(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """List available tools."""
+        return _TOOLS_RESULT
+
+    async def handle_call_tool(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle tool calls."""
+        name = params.get("name", "")
+        arguments = params.get("arguments", {})
+
+        try:
+            builder = _TOOL_PROMPTS.get(name)
+            if builder is None:
+                raise ValueError(f"Unknown tool: {name}")
+
+            prompt = builder(arguments)
+            progress_token = params.get("_meta", {}).get("progressToken")
+            if progress_token is None:
+                text = await asyncio.to_thread(_cached_completion, prompt)
+            else:
+                sent = 0
+
+                def on_delta(delta: str):
+                    nonlocal sent
+                    sent += len(delta)
+                    self._write_notification(
+                        {
+                            "jsonrpc": "2.0",
+                            "method": "notifications/progress",
+                            "params": {
+                                "progressToken": progress_token,
+                                "progress": sent,
+                                "message": delta,
+                            },
+                        }
+                    )
+
+                text = await asyncio.to_thread(
+                    _stream_completion, prompt, on_delta
+                )
+
+            return {"content": [{"type": "text", "text": text}]}
+
+        except Exception as e:
+            logger.error(f"Error in tool {name}: {e}")
+            return {
+                "content": [{"type": "text", "text": f"Error: {str(e)}"}],
+                "isError": True,
+            }
+
+    async def handle_list_resources(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """List available resources."""
+        return _RESOURCES_RESULT
+
+    async def handle_read_resource(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Read a specific resource."""
+        uri = params.get("uri", "")
+
+
+        payload = _RESOURCE_PAYLOADS.get(uri)
+        if payload is None:
             raise ValueError(f"Unknown resource: {uri}")
 
-        return {"contents": [{"type": "text", "text": resources[uri]}]}
+        return payload
 
     async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle a JSON-RPC request."""
+        if not isinstance(request, dict):
+            # A batch entry (or lone request) that parsed as valid JSON but
+            # is not an object; each gets its own error per JSON-RPC 2.0.
+            return {
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {"code": -32600, "message": "Invalid Request"},
+            }
+        rid = request.get("id")
         try:
             method = request.get("method", "")
-            params = request.get("params", {})
-            request_id = request.get("id")
-
-            if method not in self.handlers:
-                raise ValueError(f"Unknown method: {method}")
+            handler = self.handlers.get(method)
+            if handler is None:
+                # JSON-RPC "Method not found", distinct from the generic
+                # handler-failure code below.
+                return {
+                    "jsonrpc": "2.0",
+                    "id": rid,
+                    "error": {
+                        "code": -32601,
+                        "message": f"Method not found: {method}",
+                    },
+                }
 
-            result = await self.handlers[method](params)
+            # orjson has already materialized the whole frame, so there is
+            # no raw byte slice left to defer; the only avoidable work here
+            # is allocating the default dict when params are present.
+            params = request.get("params")
+            result = await handler(params if params is not None else {})
 
-            return {"jsonrpc": "2.0", "id": request_id, "result": result}
+            return {"jsonrpc": "2.0", "id": rid, "result": result}
 
         except Exception as e:
             logger.error(f"Error handling request: {e}")
             return {
                 "jsonrpc": "2.0",
-                "id": request.get("id"),
+                "id": rid,
                 "error": {"code": -1, "message": str(e)},
             }
 
+    @staticmethod
+    async def _connect_stdin():
+        """Attach an asyncio StreamReader to stdin, or None if unsupported.
+
+        connect_read_pipe fails for regular files and on platforms without
+        pipe support (notably Windows); callers fall back to executor reads.
+        """
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader()
+        try:
+            await loop.connect_read_pipe(
+                lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+            )
+        except (OSError, ValueError):
+            return None
+        return reader
+
+    def _write_notification(self, message: Dict[str, Any]):
+        """Frame and write a notification; safe to call from worker threads."""
+        if self.framing == "cbor":
+            frame = cbor2.dumps(message)
+            with _write_lock:
+                _OUT.write(len(frame).to_bytes(4, "big"))
+                _OUT.write(frame)
+                _OUT.flush()
+        else:
+            with _write_lock:
+                _OUT.write(_dumps(message))
+                _OUT.write(b"\n")
+                _OUT.flush()
+
+    @staticmethod
+    async def _read_exact(reader, loop, n: int) -> bytes:
+        """Read exactly n bytes from stdin via either read path."""
+        if reader is not None:
+            return await reader.readexactly(n)
+        data = await loop.run_in_executor(None, sys.stdin.buffer.read, n)
+        if data is None or len(data) < n:
+            raise EOFError("stdin closed mid-frame")
+        return data
+
     async def run(self):
         """Run the server using stdio."""
         try:
+            # Prefer a true async reader: no per-line thread handoff, and
+            # reads can be buffered ahead while a handler is still running.
+            reader = await self._connect_stdin()
+            loop = asyncio.get_running_loop()
             while True:
-                # Read line from stdin
-                line = await asyncio.get_event_loop().run_in_executor(
-                    None, sys.stdin.readline
-                )
+                # Capture the framing before handling: initialize may flip
+                # it, and its own response still goes out in the old frame.
+                framing = self.framing
+                if framing == "cbor":
+                    try:
+                        header = await self._read_exact(reader, loop, 4)
+                        payload = await self._read_exact(
+                            reader, loop, int.from_bytes(header, "big")
+                        )
+                    except (asyncio.IncompleteReadError, EOFError):
+                        break
+
+                    try:
+                        request = cbor2.loads(payload)
+                    except Exception as e:
+                        # Mirror the JSON path: a bad frame gets a parse
+                        # error instead of killing the read loop. The frame
+                        # length was already consumed, so the stream stays
+                        # in sync for the next header.
+                        logger.error(f"Invalid CBOR frame: {e}")
+                        frame = cbor2.dumps(
+                            {
+                                "jsonrpc": "2.0",
+                                "id": None,
+                                "error": {
+                                    "code": -32700,
+                                    "message": "Parse error",
+                                },
+                            }
+                        )
+                        with _write_lock:
+                            _OUT.write(len(frame).to_bytes(4, "big"))
+                            _OUT.write(frame)
+                            _OUT.flush()
+                        continue
+
+                    if isinstance(request, list):
+                        response = await asyncio.gather(
+                            *(self.handle_request(r) for r in request)
+                        )
+                    else:
+                        response = await self.handle_request(request)
+
+                    frame = cbor2.dumps(response)
+                    with _write_lock:
+                        _OUT.write(len(frame).to_bytes(4, "big"))
+                        _OUT.write(frame)
+                        _OUT.flush()
+                    continue
+
+                if reader is not None:
+                    line = await reader.readline()
+                else:
+                    # Read the binary buffer, not the TextIOWrapper: text-mode
+                    # readline buffers ahead past the newline, which would
+                    # swallow CBOR bytes a client pipelines right after its
+                    # initialize line. _loads accepts bytes directly.
+                    line = await loop.run_in_executor(
+                        None, sys.stdin.buffer.readline
+                    )
 
                 if not line:
                     break
 
                 try:
-                    request = json.loads(line.strip())
-                    response = await self.handle_request(request)
+                    request = _loads(line)
+
+                    if isinstance(request, list):
+                        # JSON-RPC batch: service sub-requests concurrently
+                        # so independent tool calls overlap their LLM round
+                        # trips instead of queueing.
+                        responses = await asyncio.gather(
+                            *(self.handle_request(r) for r in request)
+                        )
+                        out = _dumps(responses)
+                    else:
+                        out = _static_response_bytes(request)
+                        if out is None:
+                            response = await self.handle_request(request)
+                            out = _dumps(response)
 
                     # Write response to stdout
-                    print(json.dumps(response), flush=True)
-
-                except json.JSONDecodeError as e:
+                    with _write_lock:
+                        _OUT.write(out)
+                        _OUT.write(b"\n")
+                        _OUT.flush()
+
+                except ValueError as e:
+                    # orjson.JSONDecodeError and json.JSONDecodeError are
+                    # both ValueError subclasses.
                     logger.error(f"Invalid JSON: {e}")
                     error_response = {
                         "jsonrpc": "2.0",
                         "id": None,
                         "error": {"code": -32700, "message": "Parse error"},
                     }
-                    print(json.dumps(error_response), flush=True)
+                    with _write_lock:
+                        _OUT.write(_dumps(error_response))
+                        _OUT.write(b"\n")
+                        _OUT.flush()
 
         except KeyboardInterrupt:
             logger.info("Server stopped by user")
@@ -0,0 +1,6 @@
+"""Shared pytest configuration: make the src layout importable once."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
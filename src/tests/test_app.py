@@ -1,12 +1,17 @@
+from types import SimpleNamespace
 from unittest.mock import patch
 import pytest
 import os
+from mcp_poc import app
 from mcp_poc.ai_tools import OpenAIClient
 
 
-def test_openai_client_missing_api_key():
-    """Test that OpenAIClient raises ValueError when OPENAI_API_KEY is not set."""
-    with patch.dict(os.environ, {}, clear=True):
+@pytest.mark.parametrize(
+    "env", [{}, {"OPENAI_API_KEY": ""}], ids=["missing", "empty"]
+)
+def test_openai_client_invalid_api_key(env):
+    """Test that OpenAIClient raises ValueError when OPENAI_API_KEY is unusable."""
+    with patch.dict(os.environ, env, clear=True):
         client = OpenAIClient()
         with pytest.raises(
             ValueError, match="OPENAI_API_KEY environment variable must be set"
@@ -14,25 +19,18 @@ def test_openai_client_missing_api_key():
             client.get_client()
 
 
-def test_openai_client_empty_api_key():
-    """Test that OpenAIClient raises ValueError when OPENAI_API_KEY is empty."""
-    with patch.dict(os.environ, {"OPENAI_API_KEY": ""}):
-        client = OpenAIClient()
-        with pytest.raises(
-            ValueError, match="OPENAI_API_KEY environment variable must be set"
-        ):
-            client.get_client()
-
-
-@patch("mcp_poc.ai_tools.OpenAI")
+@patch("openai.OpenAI")
 def test_openai_client_with_valid_api_key(mock_openai):
     """Test that OpenAIClient creates client when OPENAI_API_KEY is set."""
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
         client = OpenAIClient()
         result = client.get_client()
 
-        # Should have called OpenAI constructor with the API key
-        mock_openai.assert_called_once_with(api_key="test-key")
+        # Should have called OpenAI constructor with the API key and the
+        # shared pooled HTTP client
+        mock_openai.assert_called_once()
+        assert mock_openai.call_args.kwargs["api_key"] == "test-key"
+        assert "http_client" in mock_openai.call_args.kwargs
 
         # Should return the mock client
         assert result == mock_openai.return_value
@@ -41,7 +39,7 @@ def test_openai_client_with_valid_api_key(mock_openai):
 def test_openai_client_singleton_behavior():
     """Test that OpenAIClient reuses the same client instance."""
     with patch.dict(os.environ, {"OPENAI_API_KEY": "test-key"}):
-        with patch("mcp_poc.ai_tools.OpenAI") as mock_openai:
+        with patch("openai.OpenAI") as mock_openai:
             client = OpenAIClient()
 
             # Get client twice
@@ -53,3 +51,26 @@ def test_openai_client_singleton_behavior():
 
             # Should return same instance both times
             assert result1 == result2
+
+
+def test_generate_completion_uses_stubbed_client(monkeypatch):
+    """Test generate_completion end to end against a plain-object stub.
+
+    SimpleNamespace stands in for the OpenAI response; no MagicMock
+    attribute machinery on the hot path.
+    """
+    calls = []
+
+    def fake_create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="Test response"))]
+        )
+
+    monkeypatch.setattr(app, "_default_chat_create", lambda: fake_create)
+
+    result = app.generate_completion("stub prompt", temperature=0.5)
+
+    assert result == "Test response"
+    assert len(calls) == 1
+    assert calls[0]["messages"] == [{"role": "user", "content": "stub prompt"}]
@@ -0,0 +1,38 @@
+import time
+
+from mcp_poc.cache import CompletionCache, DiskCache
+
+
+def test_disk_cache_roundtrip(tmp_path):
+    """Test that DiskCache stores and returns values across instances."""
+    path = str(tmp_path / "cache.db")
+    cache = DiskCache(path)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+    cache.close()
+
+    # A fresh instance reads the same backing file.
+    reopened = DiskCache(path)
+    assert reopened.get("key") == "value"
+    reopened.close()
+
+
+def test_disk_cache_ttl_expiry(tmp_path):
+    """Test that expired entries are treated as misses."""
+    cache = DiskCache(str(tmp_path / "cache.db"), ttl=0.01)
+    cache.set("key", "value")
+    time.sleep(0.05)
+    assert cache.get("key") is None
+    cache.close()
+
+
+def test_completion_cache_memory_eviction(tmp_path):
+    """Test that the in-memory tier evicts oldest entries but disk persists."""
+    cache = CompletionCache(str(tmp_path / "cache.db"), memory_size=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.set("c", "3")
+
+    # "a" was evicted from memory but is still served from disk.
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
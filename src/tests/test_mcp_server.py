@@ -0,0 +1,38 @@
+import mcp_poc.mcp_server as mcp_server
+
+
+def test_static_metadata_built_once():
+    """Test that prompt/tool/resource tables are stable module-level tuples."""
+    assert mcp_server._PROMPTS is mcp_server._PROMPTS
+    assert isinstance(mcp_server._PROMPTS, tuple)
+    assert isinstance(mcp_server._TOOLS, tuple)
+    assert isinstance(mcp_server._RESOURCES, tuple)
+
+    assert [p.name for p in mcp_server._PROMPTS] == [
+        "analyze_code",
+        "generate_documentation",
+        "code_review",
+        "explain_concept",
+    ]
+    assert [t.name for t in mcp_server._TOOLS] == [
+        "generate_code",
+        "refactor_code",
+        "debug_code",
+        "optimize_performance",
+        "generate_tests",
+        "batch_tools",
+    ]
+    assert len(mcp_server._RESOURCES) == 4
+
+
+def test_fast_prompt_result_matches_validated():
+    """Test that the model_construct fast path emits identical wire JSON."""
+    fast = mcp_server._build_prompt_result("desc", "body text", fast=True)
+    validated = mcp_server._build_prompt_result("desc", "body text", fast=False)
+    assert fast.model_dump_json() == validated.model_dump_json()
+
+
+def test_server_construction():
+    """Test that the MCP server wires its handlers without error."""
+    server = mcp_server.MCPAIServer()
+    assert server.server is not None
@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+
+from mcp_poc.rate_limit import CircuitBreaker, RateLimiter, retry_after_seconds
+
+
+def test_rate_limiter_allows_burst_then_delays():
+    """Test that calls within the burst are free and the next one waits."""
+    limiter = RateLimiter(rate=1.0, burst=2.0)
+    assert limiter._reserve(1.0) == 0.0
+    assert limiter._reserve(1.0) == 0.0
+    # Bucket is empty: the third call must wait roughly one refill period.
+    assert limiter._reserve(1.0) > 0.5
+
+
+def test_rate_limiter_penalize_drains_bucket():
+    """Test that penalize forces the next caller to wait the given interval."""
+    limiter = RateLimiter(rate=10.0, burst=10.0)
+    limiter.penalize(2.0)
+    assert limiter._reserve(1.0) > 2.0
+
+
+def test_circuit_breaker_opens_after_fail_max():
+    """Test that the circuit opens after consecutive failures and recovers."""
+    breaker = CircuitBreaker(fail_max=2, reset_timeout=60.0)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.allow()
+    breaker.record_failure()
+    assert not breaker.allow()
+    # Force the reset window to elapse: one half-open trial gets through,
+    # and its success closes the circuit for everyone.
+    breaker._opened_at -= 61.0
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.allow()
+
+
+def test_retry_after_seconds_parses_header():
+    """Test Retry-After extraction from an API error response."""
+    exc = SimpleNamespace(response=SimpleNamespace(headers={"retry-after": "1.5"}))
+    assert retry_after_seconds(exc) == 1.5
+
+
+def test_retry_after_seconds_missing():
+    """Test that errors without a Retry-After header return None."""
+    assert retry_after_seconds(ValueError("boom")) is None
+    exc = SimpleNamespace(response=SimpleNamespace(headers={}))
+    assert retry_after_seconds(exc) is None
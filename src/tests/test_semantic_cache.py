@@ -0,0 +1,95 @@
+from types import SimpleNamespace
+
+import pytest
+
+import mcp_poc.semantic_cache as semantic_cache
+from mcp_poc.cache import DiskCache
+from mcp_poc.semantic_cache import SemanticCache, embed_texts
+
+# Deterministic fake embeddings: near-identical prompts share a direction.
+_EMBEDDINGS = {
+    "what is python": [1.0, 0.0, 0.0],
+    "what's python": [0.99, 0.14, 0.0],
+    "how do lists work": [0.0, 1.0, 0.0],
+}
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = 0
+        self.embeddings = SimpleNamespace(create=self._create)
+
+    def _create(self, model, input):
+        self.calls += 1
+        texts = input if isinstance(input, list) else [input]
+        return SimpleNamespace(
+            data=[SimpleNamespace(embedding=_EMBEDDINGS[t]) for t in texts]
+        )
+
+
+@pytest.fixture(autouse=True)
+def _isolated_embedding_cache(tmp_path, monkeypatch):
+    """Point the module-level embedding disk cache at a temp location."""
+    monkeypatch.setattr(
+        semantic_cache, "_embedding_cache", DiskCache(str(tmp_path / "emb.db"))
+    )
+
+
+def _make_cache(tmp_path, client):
+    return SemanticCache(
+        lambda: client, path=str(tmp_path / "index.json"), threshold=0.95
+    )
+
+
+def test_semantic_cache_hits_on_paraphrase(tmp_path):
+    """Test that a reworded prompt above the threshold returns the cached answer."""
+    client = FakeClient()
+    cache = _make_cache(tmp_path, client)
+    cache.store("what is python", "Python is a programming language.")
+
+    assert cache.lookup("what's python") == "Python is a programming language."
+
+
+def test_semantic_cache_misses_on_unrelated_prompt(tmp_path):
+    """Test that dissimilar prompts are not served from the cache."""
+    client = FakeClient()
+    cache = _make_cache(tmp_path, client)
+    cache.store("what is python", "Python is a programming language.")
+
+    assert cache.lookup("how do lists work") is None
+
+
+def test_semantic_cache_memoizes_embeddings(tmp_path):
+    """Test that repeated lookups of the same text embed only once."""
+    client = FakeClient()
+    cache = _make_cache(tmp_path, client)
+    cache.store("what is python", "answer")
+    calls_after_store = client.calls
+
+    cache.lookup("what is python")
+    cache.lookup("what is python")
+    assert client.calls == calls_after_store
+
+
+def test_embed_texts_batches_misses_and_caches(tmp_path):
+    """Test that misses go out as one batched call and repeats hit disk."""
+    client = FakeClient()
+    first = embed_texts(["what is python", "how do lists work"], lambda: client)
+    assert client.calls == 1
+    assert first == [_EMBEDDINGS["what is python"], _EMBEDDINGS["how do lists work"]]
+
+    # Second call is fully served from the disk cache.
+    second = embed_texts(["what is python", "how do lists work"], lambda: client)
+    assert client.calls == 1
+    assert second == first
+
+
+def test_semantic_cache_persists_to_disk(tmp_path):
+    """Test that save() writes an index a new instance can load."""
+    client = FakeClient()
+    cache = _make_cache(tmp_path, client)
+    cache.store("what is python", "answer")
+    cache.save()
+
+    reloaded = _make_cache(tmp_path, client)
+    assert reloaded.lookup("what is python") == "answer"